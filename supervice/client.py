@@ -1,29 +1,72 @@
-import argparse
 import asyncio
 import json
 import struct
 import sys
-from typing import Any
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
 
 from supervice.models import default_socket_path
 
+if TYPE_CHECKING:
+    import argparse
+
 HEADER_SIZE = 4
 MAX_MESSAGE_SIZE = 1024 * 1024
 DEFAULT_TIMEOUT = 30.0
 
+_HDR = struct.Struct(">I")
+
+# Padded HEALTH column cells, keyed by the "healthy" field of a status entry.
+_HEALTH_CELLS = {None: f"{'-':<10}", True: f"{'OK':<10}", False: f"{'FAIL':<10}"}
+
+# Compact separators: the wire format carries no insignificant whitespace.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
+
 
 class Controller:
+    """Client for the supervice RPC socket.
+
+    Each command opens its own connection by default. Used as an async
+    context manager, the controller keeps one connection open and sends every
+    command over it, reconnecting transparently if the daemon closed it.
+    """
+
     def __init__(self, socket_path: str | None = None, timeout: float = DEFAULT_TIMEOUT):
         self.socket_path = socket_path or default_socket_path()
         self.timeout = timeout
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        # Whether the shared connection has already carried a reply.
+        self._conn_used = False
+
+    async def __aenter__(self) -> "Controller":
+        await self._connect()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._disconnect()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._conn_used = False
+
+    async def _disconnect(self) -> None:
+        writer = self._writer
+        self._reader = self._writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
 
-    async def _read_message(self, reader: asyncio.StreamReader) -> bytes | None:
+    async def _read_message(self, reader: asyncio.StreamReader) -> bytes:
         """Read a length-prefixed message from the stream."""
         # readexactly() returns exactly HEADER_SIZE bytes or raises
         # IncompleteReadError; there is no empty-return case to check.
         header = await reader.readexactly(HEADER_SIZE)
 
-        msg_length = struct.unpack(">I", header)[0]
+        msg_length = _HDR.unpack(header)[0]
 
         if msg_length > MAX_MESSAGE_SIZE:
             raise ValueError("Message too large: %d bytes" % msg_length)
@@ -31,12 +74,15 @@ class Controller:
         if msg_length == 0:
             return b""
 
+        # readexactly() waits until the whole body is buffered and copies it
+        # out once; a read() loop into a preallocated buffer would copy twice.
         return await reader.readexactly(msg_length)
 
     async def _write_message(self, writer: asyncio.StreamWriter, data: bytes) -> None:
         """Write a length-prefixed message to the stream."""
-        header = struct.pack(">I", len(data))
-        writer.write(header + data)
+        # writelines lets the transport send both buffers with one sendmsg()
+        # (Python 3.12+) instead of copying the payload into header + data.
+        writer.writelines((_HDR.pack(len(data)), data))
         await writer.drain()
 
     async def send_command(self, command: str, **kwargs: Any) -> dict[str, Any]:
@@ -53,57 +99,95 @@ class Controller:
             ) from e
 
     async def _exchange(self, command: str, **kwargs: Any) -> dict[str, Any]:
-        reader, writer = await asyncio.open_unix_connection(self.socket_path)
-
+        request = _encode_json({"command": command, **kwargs}).encode("utf-8")
+
+        if self._writer is not None:
+            data = await self._shared_roundtrip(request)
+        else:
+            reader, writer = await asyncio.open_unix_connection(self.socket_path)
+            try:
+                data = await self._roundtrip(reader, writer, request)
+            finally:
+                writer.close()
+                await writer.wait_closed()
+
+        # A zero-length frame is well-formed but carries no JSON.
+        if not data:
+            return {"status": "error", "message": "Empty response"}
+
+        # json.loads detects UTF-8 on bytes itself; no intermediate str.
+        return json.loads(data)  # type: ignore
+
+    async def _roundtrip(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: bytes
+    ) -> bytes:
+        await self._write_message(writer, request)
+        return await self._read_message(reader)
+
+    async def _shared_roundtrip(self, request: bytes) -> bytes:
+        """Send one request over the shared connection."""
         try:
-            request = {"command": command, **kwargs}
-            await self._write_message(writer, json.dumps(request).encode("utf-8"))
-
-            data = await self._read_message(reader)
-
-            if data is None:
-                return {"status": "error", "message": "Empty response"}
-
-            return json.loads(data.decode("utf-8"))  # type: ignore
-        finally:
-            writer.close()
-            await writer.wait_closed()
+            try:
+                assert self._reader is not None and self._writer is not None
+                data = await self._roundtrip(self._reader, self._writer, request)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                # A daemon that serves one request per connection closes it
+                # after replying. If a reused connection fails before a single
+                # reply byte arrived, the request was never read: reconnect
+                # and send it again. Anything else is a real failure.
+                partial = isinstance(e, asyncio.IncompleteReadError) and e.partial
+                if not self._conn_used or partial:
+                    raise
+                await self._disconnect()
+                await self._connect()
+                assert self._reader is not None and self._writer is not None
+                data = await self._roundtrip(self._reader, self._writer, request)
+        except BaseException:
+            # Framing state is unknown after a failure or timeout (a late
+            # reply could still arrive); never reuse the connection.
+            await self._disconnect()
+            raise
+        self._conn_used = True
+        return data
 
     async def status(self) -> bool:
         try:
             response = await self.send_command("status")
             if response.get("status") == "ok":
                 processes = response.get("processes", [])
-                has_health = any("healthy" in p for p in processes)
-                has_uptime = any("uptime" in p for p in processes)
-
-                header = f"{'NAME':<20} {'STATE':<10} {'PID':<10}"
+                has_health = has_uptime = False
+                for p in processes:
+                    has_health = has_health or "healthy" in p
+                    has_uptime = has_uptime or "uptime" in p
+                    if has_health and has_uptime:
+                        break
+
+                header = [f"{'NAME':<20}", f"{'STATE':<10}", f"{'PID':<10}"]
                 sep_len = 40
                 if has_uptime:
-                    header += f" {'UPTIME':<12}"
+                    header.append(f"{'UPTIME':<12}")
                     sep_len += 12
                 if has_health:
-                    header += f" {'HEALTH':<10}"
+                    header.append(f"{'HEALTH':<10}")
                     sep_len += 10
-                print(header)
-                print("-" * sep_len)
+                rows = [" ".join(header), "-" * sep_len]
 
                 for proc in processes:
-                    pid = proc.get("pid") or "-"
-                    line = f"{proc['name']:<20} {proc['state']:<10} {pid:<10}"
+                    cells = [
+                        f"{proc['name']:<20}",
+                        f"{proc['state']:<10}",
+                        f"{proc.get('pid') or '-':<10}",
+                    ]
                     if has_uptime:
                         uptime = proc.get("uptime")
-                        line += f" {_format_uptime(uptime):<12}"
+                        cells.append(f"{_format_uptime(uptime):<12}")
                     if has_health:
                         health = proc.get("healthy")
-                        if health is None:
-                            health_str = "-"
-                        elif health:
-                            health_str = "OK"
-                        else:
-                            health_str = "FAIL"
-                        line += f" {health_str:<10}"
-                    print(line)
+                        cells.append(_HEALTH_CELLS[None if health is None else bool(health)])
+                    rows.append(" ".join(cells))
+
+                # Emit the whole table in one write instead of one per row.
+                sys.stdout.write("\n".join(rows) + "\n")
                 return True
             else:
                 print("Error:", response.get("message"))
@@ -190,14 +274,83 @@ class Controller:
 def _format_uptime(seconds: int | None) -> str:
     if seconds is None:
         return "-"
-    hours, remainder = divmod(seconds, 3600)
-    minutes, secs = divmod(remainder, 60)
+    # Plain // and % avoid divmod's global lookup and tuple packing.
+    hours = seconds // 3600
+    minutes = seconds % 3600 // 60
+    secs = seconds % 60
     if hours > 0:
         return "%d:%02d:%02d" % (hours, minutes, secs)
     return "%d:%02d" % (minutes, secs)
 
 
-def main() -> None:
+# Subcommand -> number of positional arguments it takes.
+_COMMAND_ARITY = {
+    "status": 0,
+    "start": 1,
+    "stop": 1,
+    "restart": 1,
+    "startgroup": 1,
+    "stopgroup": 1,
+    "reload": 0,
+}
+
+
+def _parse_args_fast(argv: list[str]) -> SimpleNamespace | None:
+    """Parse the common, well-formed invocations without importing argparse.
+
+    Returns None for anything else (help, errors, abbreviations, unusual
+    forms) so the full argparse parser handles it with its usual messages.
+    """
+    socket: str | None = None
+    timeout = DEFAULT_TIMEOUT
+    i = 0
+    while i < len(argv) and argv[i].startswith("-"):
+        opt, eq, value = argv[i].partition("=")
+        if eq and not opt.startswith("--"):
+            # argparse reads "-s=x" as the value "=x"; leave that to it.
+            return None
+        if not eq:
+            if i + 1 >= len(argv):
+                return None
+            i += 1
+            value = argv[i]
+        if opt in ("-s", "--socket") and (eq or not value.startswith("-")):
+            socket = value
+        elif opt == "--timeout":
+            try:
+                timeout = float(value)
+            except ValueError:
+                return None
+        else:
+            return None
+        i += 1
+
+    if i >= len(argv) or argv[i] not in _COMMAND_ARITY:
+        return None
+    command = argv[i]
+    rest = argv[i + 1 :]
+
+    force = False
+    if command == "restart" and "--force" in rest:
+        rest = [arg for arg in rest if arg != "--force"]
+        force = True
+    if len(rest) != _COMMAND_ARITY[command] or any(arg.startswith("-") for arg in rest):
+        return None
+
+    return SimpleNamespace(
+        socket=socket,
+        timeout=timeout,
+        command=command,
+        name=rest[0] if rest else None,
+        force=force,
+    )
+
+
+def _build_parser() -> "argparse.ArgumentParser":
+    # Imported here: argparse (and its gettext/textwrap imports) is only
+    # needed for help, errors and invocations the fast path declines.
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="supervicectl",
         description="Supervice process control client",
@@ -241,11 +394,18 @@ def main() -> None:
 
     subparsers.add_parser("reload", help="Reload configuration")
 
-    args = parser.parse_args()
+    return parser
 
-    if not args.command:
-        parser.print_help()
-        sys.exit(1)
+
+def main() -> None:
+    args: argparse.Namespace | SimpleNamespace | None = _parse_args_fast(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+
+        if not args.command:
+            parser.print_help()
+            sys.exit(1)
 
     client = Controller(socket_path=args.socket, timeout=args.timeout)
 
@@ -1,6 +1,11 @@
 import configparser
+import functools
 import os
+import pwd
+import re
 import shlex
+import signal
+import stat
 
 from supervice.models import (
     DEFAULT_CHILD_LOG_BACKUPS,
@@ -11,153 +16,141 @@ from supervice.models import (
     SupervisorConfig,
 )
 
-# Valid signal names (without SIG prefix)
-VALID_SIGNALS = frozenset(
-    {
-        "HUP",
-        "INT",
-        "QUIT",
-        "ILL",
-        "TRAP",
-        "ABRT",
-        "BUS",
-        "FPE",
-        "KILL",
-        "USR1",
-        "SEGV",
-        "USR2",
-        "PIPE",
-        "ALRM",
-        "TERM",
-        "STKFLT",
-        "CHLD",
-        "CONT",
-        "STOP",
-        "TSTP",
-        "TTIN",
-        "TTOU",
-        "URG",
-        "XCPU",
-        "XFSZ",
-        "VTALRM",
-        "PROF",
-        "WINCH",
-        "IO",
-        "PWR",
-        "SYS",
-    }
-)
+# Valid signal names (without SIG prefix). Taken from the platform so a name
+# validates exactly when the signal module can resolve it at stop time.
+VALID_SIGNALS = frozenset(name.removeprefix("SIG") for name in signal.Signals.__members__)
+# Only ever needed for error messages; sorted once rather than per failure.
+_VALID_SIGNALS_STR = ", ".join(sorted(VALID_SIGNALS))
+# Signal number for every accepted stopsignal spelling (after upper-casing):
+# "TERM" and "SIGTERM" alike.
+SIGNAL_NUMBERS: dict[str, int] = {
+    spelling: int(sig)
+    for name, sig in signal.Signals.__members__.items()
+    for spelling in (name, name.removeprefix("SIG"))
+}
+
+_VALID_LOGLEVELS = frozenset({"DEBUG", "INFO", "WARNING", "WARN", "ERROR", "CRITICAL"})
+_VALID_LOGLEVELS_STR = ", ".join(sorted(_VALID_LOGLEVELS))
+
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
+# One environment entry: KEY=value, KEY="value" or KEY='value'. Separators
+# after a quoted value are consumed with it; a bare value owns one comma.
+_ENV_RE = re.compile(r"""([^=]*)=[ \t]*(?:"([^"]*)"?[, \t]*|'([^']*)'?[, \t]*|([^,]*),?)""")
 
 
 class ConfigValidationError(ValueError):
-    """Raised when config validation fails."""
+    """Raised when config validation fails.
+
+    ``field`` names the offending config key when the error is about one.
+    """
 
-    pass
+    def __init__(self, message: str, *, field: str | None = None) -> None:
+        super().__init__(message)
+        self.field = field
 
 
 def _parse_bool(value: str) -> bool:
-    return value.lower() in ("true", "1", "yes", "on")
+    return value.lower() in _TRUTHY
+
+
+def _get_int(values: dict[str, str], option: str, default: int) -> int:
+    """Integer option lookup with the same conversion as SectionProxy.getint."""
+    value = values.get(option)
+    return default if value is None else int(value)
 
 
 def _parse_env(value: str) -> dict[str, str]:
+    """Parse ``KEY=val,KEY2="quoted, val"`` into a dict.
+
+    Quoted values are taken literally (an unterminated quote runs to the end
+    of the string); bare values end at the next comma and are stripped.
+    """
     env: dict[str, str] = {}
-    if not value:
-        return env
-
-    i = 0
-    n = len(value)
-    while i < n:
-        while i < n and value[i] in (" ", "\t"):
-            i += 1
-        if i >= n:
-            break
-
-        eq_pos = value.find("=", i)
-        if eq_pos < 0:
-            break
-        key = value[i:eq_pos].strip()
-        i = eq_pos + 1
-
-        while i < n and value[i] in (" ", "\t"):
-            i += 1
-        if i >= n:
-            env[key] = ""
-            break
-
-        if value[i] in ('"', "'"):
-            quote = value[i]
-            i += 1
-            val_start = i
-            while i < n and value[i] != quote:
-                i += 1
-            env[key] = value[val_start:i]
-            if i < n:
-                i += 1
-            while i < n and value[i] in (",", " ", "\t"):
-                i += 1
+    for match in _ENV_RE.finditer(value):
+        key, double_quoted, single_quoted, bare = match.groups()
+        if double_quoted is not None:
+            env[key.strip()] = double_quoted
+        elif single_quoted is not None:
+            env[key.strip()] = single_quoted
         else:
-            val_start = i
-            while i < n and value[i] != ",":
-                i += 1
-            env[key] = value[val_start:i].strip()
-            if i < n:
-                i += 1
-
+            env[key.strip()] = bare.strip()
     return env
 
 
-def _validate_signal(sig_name: str, program_name: str) -> None:
-    """Validate that a signal name is valid."""
-    sig_upper = sig_name.upper()
-    if sig_upper not in VALID_SIGNALS:
-        # Also check with SIG prefix stripped
-        if sig_upper.startswith("SIG"):
-            sig_upper = sig_upper[3:]
-        if sig_upper not in VALID_SIGNALS:
-            raise ConfigValidationError(
-                "Program '%s': invalid stopsignal '%s'. Valid signals: %s"
-                % (program_name, sig_name, ", ".join(sorted(VALID_SIGNALS)))
-            )
+def _validate_signal(sig_name: str, program_name: str) -> int:
+    """Validate a signal name and return its number."""
+    signum = SIGNAL_NUMBERS.get(sig_name.upper())
+    if signum is None:
+        raise ConfigValidationError(
+            "Program '%s': invalid stopsignal '%s'. Valid signals: %s"
+            % (program_name, sig_name, _VALID_SIGNALS_STR),
+            field="stopsignal",
+        )
+    return signum
+
+
+@functools.cache
+def _user_exists(username: str) -> bool:
+    """Memoized passwd lookup; parse_config clears it so reloads see new users."""
+    try:
+        pwd.getpwnam(username)
+    except KeyError:
+        return False
+    return True
 
 
 def _validate_user(username: str, program_name: str) -> None:
     """Validate that a user exists on the system."""
-    import pwd
+    if not _user_exists(username):
+        raise ConfigValidationError(
+            "Program '%s': user '%s' does not exist" % (program_name, username),
+            field="user",
+        )
+
+
+@functools.cache
+def _dir_problem(path: str, mode: int) -> str | None:
+    """Why ``path`` is not a directory usable with ``mode``, or None if it is.
 
+    Memoized because programs commonly share a working or log directory;
+    parse_config clears it at the start of every load.
+    """
+    # One stat answers both "exists" and "is a directory".
     try:
-        pwd.getpwnam(username)
-    except KeyError as e:
-        raise ConfigValidationError(
-            "Program '%s': user '%s' does not exist" % (program_name, username)
-        ) from e
+        st = os.stat(path)
+    except OSError:
+        return "does not exist"
+    if not stat.S_ISDIR(st.st_mode):
+        return "is not a directory"
+    if not os.access(path, mode):
+        return "is not accessible" if mode == os.X_OK else "is not writable"
+    return None
 
 
 def _validate_directory(directory: str, program_name: str) -> None:
     """Validate that a directory exists and is accessible."""
-    if not os.path.exists(directory):
+    problem = _dir_problem(directory, os.X_OK)
+    if problem == "is not a directory":
         raise ConfigValidationError(
-            "Program '%s': directory '%s' does not exist" % (program_name, directory)
+            "Program '%s': '%s' is not a directory" % (program_name, directory),
+            field="directory",
         )
-    if not os.path.isdir(directory):
+    if problem:
         raise ConfigValidationError(
-            "Program '%s': '%s' is not a directory" % (program_name, directory)
-        )
-    if not os.access(directory, os.X_OK):
-        raise ConfigValidationError(
-            "Program '%s': directory '%s' is not accessible" % (program_name, directory)
+            "Program '%s': directory '%s' %s" % (program_name, directory, problem),
+            field="directory",
         )
 
 
-def _validate_logfile_path(logfile: str, program_name: str) -> None:
+def _validate_logfile_path(logfile: str, field_name: str, program_name: str) -> None:
     """Validate that the parent directory of a logfile exists and is writable."""
     parent_dir = os.path.dirname(logfile) or "."
-    if not os.path.exists(parent_dir):
-        raise ConfigValidationError(
-            "Program '%s': log directory '%s' does not exist" % (program_name, parent_dir)
-        )
-    if not os.access(parent_dir, os.W_OK):
+    problem = _dir_problem(parent_dir, os.W_OK)
+    if problem:
         raise ConfigValidationError(
-            "Program '%s': log directory '%s' is not writable" % (program_name, parent_dir)
+            "Program '%s': log directory '%s' %s" % (program_name, parent_dir, problem),
+            field=field_name,
         )
 
 
@@ -165,7 +158,8 @@ def _validate_positive_int(value: int, field_name: str, program_name: str) -> No
     """Validate that a value is a positive integer."""
     if value < 0:
         raise ConfigValidationError(
-            "Program '%s': %s must be non-negative, got %d" % (program_name, field_name, value)
+            "Program '%s': %s must be non-negative, got %d" % (program_name, field_name, value),
+            field=field_name,
         )
 
 
@@ -178,22 +172,26 @@ def _validate_healthcheck(hc: HealthCheckConfig, program_name: str) -> None:
 
     if hc.interval == 0:
         raise ConfigValidationError(
-            "Program '%s': healthcheck_interval must be at least 1" % program_name
+            "Program '%s': healthcheck_interval must be at least 1" % program_name,
+            field="healthcheck_interval",
         )
 
     if hc.type == HealthCheckType.TCP:
         if hc.port is None:
             raise ConfigValidationError(
-                "Program '%s': healthcheck_port is required for TCP health checks" % program_name
+                "Program '%s': healthcheck_port is required for TCP health checks" % program_name,
+                field="healthcheck_port",
             )
         if hc.port < 1 or hc.port > 65535:
             raise ConfigValidationError(
-                "Program '%s': healthcheck_port must be between 1 and 65535" % program_name
+                "Program '%s': healthcheck_port must be between 1 and 65535" % program_name,
+                field="healthcheck_port",
             )
     elif hc.type == HealthCheckType.SCRIPT:
         if not hc.command:
             raise ConfigValidationError(
-                "Program '%s': healthcheck_command required for script checks" % program_name
+                "Program '%s': healthcheck_command required for script checks" % program_name,
+                field="healthcheck_command",
             )
 
 
@@ -203,10 +201,12 @@ def _validate_command(command: str, program_name: str) -> None:
         args = shlex.split(command)
     except ValueError as e:
         raise ConfigValidationError(
-            "Program '%s': command does not parse: %s" % (program_name, e)
+            "Program '%s': command does not parse: %s" % (program_name, e), field="command"
         ) from e
     if not args:
-        raise ConfigValidationError("Program '%s': command is empty" % program_name)
+        raise ConfigValidationError(
+            "Program '%s': command is empty" % program_name, field="command"
+        )
 
 
 def _validate_program(prog: ProgramConfig) -> None:
@@ -222,7 +222,9 @@ def _validate_program(prog: ProgramConfig) -> None:
     _validate_positive_int(prog.stderr_logfile_backups, "stderr_logfile_backups", prog.name)
 
     if prog.numprocs == 0:
-        raise ConfigValidationError("Program '%s': numprocs must be at least 1" % prog.name)
+        raise ConfigValidationError(
+            "Program '%s': numprocs must be at least 1" % prog.name, field="numprocs"
+        )
 
     _validate_command(prog.command, prog.name)
 
@@ -239,9 +241,9 @@ def _validate_program(prog: ProgramConfig) -> None:
 
     # Validate log file paths if specified
     if prog.stdout_logfile:
-        _validate_logfile_path(prog.stdout_logfile, prog.name)
+        _validate_logfile_path(prog.stdout_logfile, "stdout_logfile", prog.name)
     if prog.stderr_logfile:
-        _validate_logfile_path(prog.stderr_logfile, prog.name)
+        _validate_logfile_path(prog.stderr_logfile, "stderr_logfile", prog.name)
 
     # Validate health check if configured
     if prog.healthcheck.type != HealthCheckType.NONE:
@@ -252,14 +254,27 @@ def parse_config(path: str) -> SupervisorConfig:
     if not os.path.exists(path):
         raise FileNotFoundError("Config file not found: %s" % path)
 
+    # Open explicitly (not parser.read) so an unreadable file raises a real
+    # error instead of being silently ignored.
+    with open(path) as f:
+        source = f.read()
+
+    return parse_config_string(source, path)
+
+
+def parse_config_string(source: str, name: str = "<string>") -> SupervisorConfig:
+    """Parse configuration text directly; ``name`` labels parse errors."""
+    # Programs commonly share a user and directories; look each one up once
+    # per load (NSS may be LDAP/SSSD), but never carry answers over to the
+    # next load.
+    _user_exists.cache_clear()
+    _dir_problem.cache_clear()
+
     # interpolation=None: values are taken literally. This is required so that
     # bare '%' works in commands (e.g. date +%s) and the %(process_num)s
     # template survives to be expanded by the supervisor itself.
     parser = configparser.ConfigParser(interpolation=None)
-    # Use read_file (not read) so an unreadable file raises a real error instead
-    # of being silently ignored.
-    with open(path) as f:
-        parser.read_file(f)
+    parser.read_string(source, source=name)
 
     sup_config = SupervisorConfig()
 
@@ -274,108 +289,115 @@ def parse_config(path: str) -> SupervisorConfig:
         sup_config.log_backups = sect.getint("log_backups", sup_config.log_backups)
 
         # Validate loglevel
-        valid_levels = {"DEBUG", "INFO", "WARNING", "WARN", "ERROR", "CRITICAL"}
-        if sup_config.loglevel.upper() not in valid_levels:
+        if sup_config.loglevel.upper() not in _VALID_LOGLEVELS:
             raise ConfigValidationError(
                 "Invalid loglevel '%s'. Valid levels: %s"
-                % (sup_config.loglevel, ", ".join(sorted(valid_levels)))
+                % (sup_config.loglevel, _VALID_LOGLEVELS_STR),
+                field="loglevel",
             )
 
         # Validate numeric bounds
         if sup_config.shutdown_timeout <= 0:
-            raise ConfigValidationError("shutdown_timeout must be positive")
+            raise ConfigValidationError(
+                "shutdown_timeout must be positive", field="shutdown_timeout"
+            )
         if sup_config.log_maxbytes < 0:
-            raise ConfigValidationError("log_maxbytes must be non-negative")
+            raise ConfigValidationError("log_maxbytes must be non-negative", field="log_maxbytes")
         if sup_config.log_backups < 0:
-            raise ConfigValidationError("log_backups must be non-negative")
+            raise ConfigValidationError("log_backups must be non-negative", field="log_backups")
 
+    # Partition sections once instead of rescanning them per kind.
+    program_sections: list[tuple[str, dict[str, str]]] = []
+    group_sections: list[tuple[str, configparser.SectionProxy]] = []
     for section in parser.sections():
-        if section.startswith("program:"):
-            name = section.split(":", 1)[1]
-            sect = parser[section]
-
-            # Parse health check configuration
-            hc_type_str = sect.get("healthcheck_type", "none").lower()
-            hc_type = HealthCheckType.NONE
-            if hc_type_str == "tcp":
-                hc_type = HealthCheckType.TCP
-            elif hc_type_str == "script":
-                hc_type = HealthCheckType.SCRIPT
-
-            healthcheck = HealthCheckConfig(
-                type=hc_type,
-                interval=sect.getint("healthcheck_interval", 30),
-                timeout=sect.getint("healthcheck_timeout", 10),
-                retries=sect.getint("healthcheck_retries", 3),
-                start_period=sect.getint("healthcheck_start_period", 10),
-                port=sect.getint("healthcheck_port") if sect.get("healthcheck_port") else None,
-                host=sect.get("healthcheck_host", "127.0.0.1"),
-                command=sect.get("healthcheck_command"),
-            )
+        kind, sep, section_name = section.partition(":")
+        if not sep:
+            continue
+        if kind == "program":
+            # Snapshot the options (defaults merged) into a plain dict once;
+            # SectionProxy.get goes through several layers per lookup.
+            program_sections.append((section_name, dict(parser.items(section))))
+        elif kind == "group":
+            group_sections.append((section_name, parser[section]))
+
+    for name, values in program_sections:
+        # Bound once: each program reads ~25 options.
+        get = values.get
+        getint = functools.partial(_get_int, values)
+
+        # Parse health check configuration
+        hc_type_str = get("healthcheck_type", "none").lower()
+        hc_type = HealthCheckType.NONE
+        if hc_type_str == "tcp":
+            hc_type = HealthCheckType.TCP
+        elif hc_type_str == "script":
+            hc_type = HealthCheckType.SCRIPT
+
+        healthcheck = HealthCheckConfig(
+            type=hc_type,
+            interval=getint("healthcheck_interval", 30),
+            timeout=getint("healthcheck_timeout", 10),
+            retries=getint("healthcheck_retries", 3),
+            start_period=getint("healthcheck_start_period", 10),
+            port=int(values["healthcheck_port"]) if get("healthcheck_port") else None,
+            host=get("healthcheck_host", "127.0.0.1"),
+            command=get("healthcheck_command"),
+        )
 
-            prog = ProgramConfig(
-                name=name,
-                command=sect.get("command", ""),
-                numprocs=sect.getint("numprocs", 1),
-                autostart=_parse_bool(sect.get("autostart", "true")),
-                autorestart=_parse_bool(sect.get("autorestart", "true")),
-                startsecs=sect.getint("startsecs", 1),
-                startretries=sect.getint("startretries", 3),
-                stopsignal=sect.get("stopsignal", "TERM"),
-                stopwaitsecs=sect.getint("stopwaitsecs", 10),
-                stdout_logfile=sect.get("stdout_logfile"),
-                stderr_logfile=sect.get("stderr_logfile"),
-                stdout_logfile_maxbytes=sect.getint(
-                    "stdout_logfile_maxbytes", DEFAULT_CHILD_LOG_MAXBYTES
-                ),
-                stdout_logfile_backups=sect.getint(
-                    "stdout_logfile_backups", DEFAULT_CHILD_LOG_BACKUPS
-                ),
-                stderr_logfile_maxbytes=sect.getint(
-                    "stderr_logfile_maxbytes", DEFAULT_CHILD_LOG_MAXBYTES
-                ),
-                stderr_logfile_backups=sect.getint(
-                    "stderr_logfile_backups", DEFAULT_CHILD_LOG_BACKUPS
-                ),
-                environment=_parse_env(sect.get("environment", "")),
-                directory=sect.get("directory"),
-                user=sect.get("user"),
-                pdeathsig=_parse_bool(sect.get("pdeathsig", "true")),
-                healthcheck=healthcheck,
-            )
+        prog = ProgramConfig(
+            name=name,
+            command=get("command", ""),
+            numprocs=getint("numprocs", 1),
+            autostart=_parse_bool(get("autostart", "true")),
+            autorestart=_parse_bool(get("autorestart", "true")),
+            startsecs=getint("startsecs", 1),
+            startretries=getint("startretries", 3),
+            stopsignal=get("stopsignal", "TERM"),
+            stopwaitsecs=getint("stopwaitsecs", 10),
+            stdout_logfile=get("stdout_logfile"),
+            stderr_logfile=get("stderr_logfile"),
+            stdout_logfile_maxbytes=getint("stdout_logfile_maxbytes", DEFAULT_CHILD_LOG_MAXBYTES),
+            stdout_logfile_backups=getint("stdout_logfile_backups", DEFAULT_CHILD_LOG_BACKUPS),
+            stderr_logfile_maxbytes=getint("stderr_logfile_maxbytes", DEFAULT_CHILD_LOG_MAXBYTES),
+            stderr_logfile_backups=getint("stderr_logfile_backups", DEFAULT_CHILD_LOG_BACKUPS),
+            environment=_parse_env(get("environment", "")),
+            directory=get("directory"),
+            user=get("user"),
+            pdeathsig=_parse_bool(get("pdeathsig", "true")),
+            healthcheck=healthcheck,
+        )
 
-            if not prog.command:
-                raise ConfigValidationError("Program '%s': missing command" % name)
+        if not prog.command:
+            raise ConfigValidationError("Program '%s': missing command" % name, field="command")
 
-            # Validate the program configuration
-            _validate_program(prog)
+        # Validate the program configuration
+        _validate_program(prog)
 
-            sup_config.programs.append(prog)
+        sup_config.programs.append(prog)
 
     # Process groups
     # Groups are defined as [group:foo]
     # programs=bar,baz
-    for section in parser.sections():
-        if section.startswith("group:"):
-            group_name = section.split(":", 1)[1]
-            sect = parser[section]
-            programs_str = sect.get("programs", "")
-            if not programs_str:
-                continue
-
-            program_names = [p.strip() for p in programs_str.split(",") if p.strip()]
-
-            # A group member that references no defined program is a config
-            # error, not something to silently ignore.
-            known = {prog.name for prog in sup_config.programs}
-            unknown = [p for p in program_names if p not in known]
-            if unknown:
-                raise ConfigValidationError(
-                    "Group '%s': unknown program(s): %s" % (group_name, ", ".join(unknown))
-                )
-
-            for prog in sup_config.programs:
-                if prog.name in program_names:
-                    prog.group = group_name
+    # Members are resolved through a name index built once, so each group
+    # costs O(members) rather than a scan over every program.
+    programs_by_name = {prog.name: prog for prog in sup_config.programs}
+    for group_name, sect in group_sections:
+        programs_str = sect.get("programs", "")
+        if not programs_str:
+            continue
+
+        program_names = [p.strip() for p in programs_str.split(",") if p.strip()]
+
+        # A group member that references no defined program is a config
+        # error, not something to silently ignore.
+        unknown = [p for p in program_names if p not in programs_by_name]
+        if unknown:
+            raise ConfigValidationError(
+                "Group '%s': unknown program(s): %s" % (group_name, ", ".join(unknown)),
+                field="programs",
+            )
+
+        for member in program_names:
+            programs_by_name[member].group = group_name
 
     return sup_config
@@ -11,13 +11,14 @@ from supervice.models import HealthCheckType, ProgramConfig, SupervisorConfig
 from supervice.process import Process
 from supervice.rpc import RPCServer
 
+logger = get_logger()
+
 
 class Supervisor:
     def __init__(self) -> None:
         self.config: SupervisorConfig = SupervisorConfig()
         self.processes: dict[str, Process] = {}
         self.groups: dict[str, list[str]] = {}
-        self.logger = get_logger()
         self.event_bus = EventBus()
         self._shutdown_event = asyncio.Event()
         self.rpc_server: RPCServer | None = None
@@ -26,25 +27,28 @@ class Supervisor:
         self._reload_lock = asyncio.Lock()
 
     def load_config(self, path: str) -> None:
-        self.logger.info("Loading config from %s", path)
+        logger.info("Loading config from %s", path)
         self._config_path = path
         try:
             self.config = parse_config(path)
             # Initialize RPC server with configured socket path
             self.rpc_server = RPCServer(self.config.socket_path, self)
         except Exception as e:
-            self.logger.critical("Failed to load config: %s", e)
+            logger.critical("Failed to load config: %s", e)
             raise
 
         self._create_processes(self.config.programs)
         self._rebuild_groups(self.config.programs)
 
     @staticmethod
-    def _expand(value: str, process_num: int) -> str:
-        return value.replace("%(process_num)s", "%02d" % process_num)
+    def _expand(value: str, process_num: str) -> str:
+        # Most values carry no template; skip building a new string for them.
+        if "%(process_num)s" not in value:
+            return value
+        return value.replace("%(process_num)s", process_num)
 
     @classmethod
-    def _expand_opt(cls, value: str | None, process_num: int) -> str | None:
+    def _expand_opt(cls, value: str | None, process_num: str) -> str | None:
         if value is None:
             return None
         return cls._expand(value, process_num)
@@ -64,45 +68,51 @@ class Supervisor:
         logfile paths. This is the single source of truth for instance configs:
         creation and change-detection must both use it, or reloads misreport.
         """
+        # Formatted once and shared by the name and every expanded field.
+        num = "%02d" % process_num
         if prog.numprocs > 1:
-            name = "%s:%02d" % (prog.name, process_num)
+            name = "%s:%s" % (prog.name, num)
         else:
             name = prog.name
         return replace(
             prog,
             name=name,
-            command=cls._expand(prog.command, process_num),
-            environment={k: cls._expand(v, process_num) for k, v in prog.environment.items()},
-            stdout_logfile=cls._expand_opt(prog.stdout_logfile, process_num),
-            stderr_logfile=cls._expand_opt(prog.stderr_logfile, process_num),
+            command=cls._expand(prog.command, num),
+            environment={k: cls._expand(v, num) for k, v in prog.environment.items()},
+            stdout_logfile=cls._expand_opt(prog.stdout_logfile, num),
+            stderr_logfile=cls._expand_opt(prog.stderr_logfile, num),
         )
 
+    def _warn_numprocs_pitfalls(self, prog_config: ProgramConfig) -> None:
+        if prog_config.numprocs <= 1:
+            return
+        for field_name in ("stdout_logfile", "stderr_logfile"):
+            logpath = getattr(prog_config, field_name)
+            if logpath and "%(process_num)s" not in logpath:
+                logger.warning(
+                    "Program '%s': %s=%s has no %%(process_num)s but numprocs=%d; "
+                    "all instances will write to the same file with interleaved output",
+                    prog_config.name,
+                    field_name,
+                    logpath,
+                    prog_config.numprocs,
+                )
+        if prog_config.healthcheck.type == HealthCheckType.TCP:
+            logger.warning(
+                "Program '%s': numprocs=%d with a TCP health check: all instances "
+                "will probe the same port %s; use %%(process_num)s in the command "
+                "to give each instance its own port",
+                prog_config.name,
+                prog_config.numprocs,
+                prog_config.healthcheck.port,
+            )
+
     def _create_processes(
         self,
         programs: list[ProgramConfig],
     ) -> None:
         for prog_config in programs:
-            if prog_config.numprocs > 1:
-                for field_name in ("stdout_logfile", "stderr_logfile"):
-                    logpath = getattr(prog_config, field_name)
-                    if logpath and "%(process_num)s" not in logpath:
-                        self.logger.warning(
-                            "Program '%s': %s=%s has no %%(process_num)s but numprocs=%d; "
-                            "all instances will write to the same file with interleaved output",
-                            prog_config.name,
-                            field_name,
-                            logpath,
-                            prog_config.numprocs,
-                        )
-                if prog_config.healthcheck.type == HealthCheckType.TCP:
-                    self.logger.warning(
-                        "Program '%s': numprocs=%d with a TCP health check: all instances "
-                        "will probe the same port %s; use %%(process_num)s in the command "
-                        "to give each instance its own port",
-                        prog_config.name,
-                        prog_config.numprocs,
-                        prog_config.healthcheck.port,
-                    )
+            self._warn_numprocs_pitfalls(prog_config)
             for i in range(prog_config.numprocs):
                 p_conf = self._instance_config(prog_config, i)
                 if p_conf.name not in self.processes:
@@ -125,7 +135,7 @@ class Supervisor:
         self.groups = groups
 
     async def run(self) -> None:
-        self.logger.info("Supervisor starting")
+        logger.info("Supervisor starting")
 
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
@@ -143,11 +153,10 @@ class Supervisor:
             if self.rpc_server:
                 await self.rpc_server.start()
 
-            start_tasks = []
+            # start() only schedules each supervision task, so awaiting them in
+            # turn costs nothing; gather() would wrap every one in a Task first.
             for process in self.processes.values():
-                start_tasks.append(process.start())
-            if start_tasks:
-                await asyncio.gather(*start_tasks)
+                await process.start()
 
             await self._shutdown_event.wait()
         finally:
@@ -156,35 +165,46 @@ class Supervisor:
             try:
                 await self.shutdown()
             except Exception:
-                self.logger.critical("Error during shutdown", exc_info=True)
+                logger.critical("Error during shutdown", exc_info=True)
 
     def _handle_signal(self, sig: int) -> None:
-        self.logger.info("Received signal %d", sig)
+        logger.info("Received signal %d", sig)
         self._shutdown_event.set()
 
     def _handle_sighup(self) -> None:
-        self.logger.info("Received SIGHUP, ignoring (use 'reload' command instead)")
+        logger.info("Received SIGHUP, ignoring (use 'reload' command instead)")
 
     async def reload_config(self) -> dict[str, list[str]]:
         async with self._reload_lock:
             return await self._reload_config_locked()
 
     async def _reload_config_locked(self) -> dict[str, list[str]]:
-        self.logger.info("Reloading config from %s", self._config_path)
+        logger.info("Reloading config from %s", self._config_path)
         new_config = parse_config(self._config_path)
 
-        old_names = set(self.processes.keys())
-        new_names: set[str] = set()
-        new_programs: list[ProgramConfig] = []
+        # Processes and groups are derived from the config alone, so an
+        # identical config (e.g. a periodic SIGHUP) has nothing to reconcile.
+        if new_config == self.config:
+            logger.info("Reload complete: config unchanged")
+            return {"added": [], "removed": [], "changed": []}
 
+        # Expand every program to its instance configs once; membership and
+        # change detection below are then plain dict lookups.
+        new_instances: dict[str, ProgramConfig] = {}
         for prog in new_config.programs:
-            for name in self._instance_names(prog):
-                new_names.add(name)
-            new_programs.append(prog)
+            for i in range(prog.numprocs):
+                inst = self._instance_config(prog, i)
+                new_instances[inst.name] = inst
+
+        old_names = set(self.processes.keys())
+        # The index's key view doubles as the new name set.
+        new_names = new_instances.keys()
 
         added = new_names - old_names
         removed = old_names - new_names
-        changed = [n for n in (old_names & new_names) if self._program_changed(n, new_config)]
+        changed = [
+            n for n in (old_names & new_names) if self.processes[n].config != new_instances[n]
+        ]
 
         for name in removed:
             proc = self.processes[name]
@@ -193,18 +213,19 @@ class Supervisor:
             del self.processes[name]
 
         if added:
-            self._create_processes(new_programs)
+            for prog in new_config.programs:
+                self._warn_numprocs_pitfalls(prog)
+            # Create from the already-expanded configs, in config order.
+            for name, inst in new_instances.items():
+                if name in added:
+                    self.processes[name] = Process(inst, self.event_bus)
             for name in added:
-                if name in self.processes:
-                    await self.processes[name].start()
+                await self.processes[name].start()
 
         # Apply changed configs to the existing Process objects so the next
         # (manual or automatic) restart actually uses the new settings.
-        for prog in new_config.programs:
-            for i in range(prog.numprocs):
-                inst = self._instance_config(prog, i)
-                if inst.name in changed and inst.name in self.processes:
-                    self.processes[inst.name].update_config(inst)
+        for name in changed:
+            self.processes[name].update_config(new_instances[name])
 
         self.config = new_config
 
@@ -214,7 +235,7 @@ class Supervisor:
         self._rebuild_groups(new_config.programs)
 
         for name in changed:
-            self.logger.info(
+            logger.info(
                 "Program '%s': config updated; takes effect on next restart", name
             )
 
@@ -223,20 +244,9 @@ class Supervisor:
             "removed": sorted(removed),
             "changed": sorted(changed),
         }
-        self.logger.info("Reload complete: %s", result)
+        logger.info("Reload complete: %s", result)
         return result
 
-    def _program_changed(self, name: str, new_config: SupervisorConfig) -> bool:
-        old_proc = self.processes.get(name)
-        if not old_proc:
-            return False
-        for prog in new_config.programs:
-            for i in range(prog.numprocs):
-                inst = self._instance_config(prog, i)
-                if inst.name == name:
-                    return old_proc.config != inst
-        return False
-
     def _acquire_pidfile_lock(self) -> None:
         fd = os.open(self.config.pidfile, os.O_WRONLY | os.O_CREAT, 0o600)
         try:
@@ -244,7 +254,7 @@ class Supervisor:
         except (BlockingIOError, OSError) as e:
             os.close(fd)
             msg = "Another supervice instance is already running (pidfile: %s)"
-            self.logger.critical(msg, self.config.pidfile)
+            logger.critical(msg, self.config.pidfile)
             raise RuntimeError(msg % self.config.pidfile) from e
         os.ftruncate(fd, 0)
         os.lseek(fd, 0, os.SEEK_SET)
@@ -272,7 +282,7 @@ class Supervisor:
                     pass
 
     async def shutdown(self) -> None:
-        self.logger.info("Shutting down...")
+        logger.info("Shutting down...")
 
         if self.rpc_server:
             await self.rpc_server.stop()
@@ -289,7 +299,7 @@ class Supervisor:
                     timeout=self.config.shutdown_timeout,
                 )
             except asyncio.TimeoutError:
-                self.logger.warning(
+                logger.warning(
                     "Shutdown timed out after %ds, some processes may not have stopped cleanly",
                     self.config.shutdown_timeout,
                 )
@@ -300,4 +310,4 @@ class Supervisor:
         # alive, orphaning them.
         self._release_pidfile_lock()
 
-        self.logger.info("Shutdown complete")
+        logger.info("Shutdown complete")
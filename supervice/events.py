@@ -1,16 +1,21 @@
 import asyncio
+import collections
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import IntEnum, auto
 from typing import Any
 
 from supervice.logger import get_logger
 
+logger = get_logger()
+
 # Maximum events that can be queued before backpressure
 MAX_EVENT_QUEUE_SIZE = 1000
+# Events dispatched per consumer wakeup before yielding to the loop
+EVENT_DRAIN_BATCH = 256
 
 
-class EventType(Enum):
+class EventType(IntEnum):
     PROCESS_STATE_STARTING = auto()
     PROCESS_STATE_RUNNING = auto()
     PROCESS_STATE_BACKOFF = auto()
@@ -24,7 +29,7 @@ class EventType(Enum):
     HEALTHCHECK_FAILED = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     type: EventType
     payload: dict[str, Any]
@@ -34,19 +39,29 @@ EventHandler = Callable[[Event], Awaitable[None]]
 
 
 class EventBus:
+    __slots__ = ("subscribers", "_queue", "_not_empty", "_task", "_started", "_dropped_events")
+
     def __init__(self, maxsize: int = MAX_EVENT_QUEUE_SIZE) -> None:
-        self.subscribers: dict[EventType, list[EventHandler]] = {}
-        self.logger = get_logger()
-        # Bounded queue to prevent memory exhaustion
-        self._queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=maxsize)
+        # Handler tuples are replaced, never mutated, so dispatch can iterate
+        # one without copying while a handler subscribes another.
+        self.subscribers: dict[EventType, tuple[EventHandler, ...]] = {}
+        # Bounded to prevent memory exhaustion: once full, appending drops the
+        # oldest event. A single consumer task drains it, so no locking.
+        self._queue: collections.deque[Event] = collections.deque(maxlen=maxsize or None)
+        self._not_empty = asyncio.Event()
         self._task: asyncio.Task[None] | None = None
+        self._started = False
         self._dropped_events = 0
 
     def start(self) -> None:
-        if not self._task:
+        # The consumer task is created lazily: with no subscribers there is
+        # nothing to dispatch, so subscribe() starts it on first use.
+        self._started = True
+        if self.subscribers and not self._task:
             self._task = asyncio.create_task(self._process_events())
 
     async def stop(self) -> None:
+        self._started = False
         if self._task:
             self._task.cancel()
             try:
@@ -55,38 +70,63 @@ class EventBus:
                 pass
 
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(handler)
+        self.subscribers[event_type] = self.subscribers.get(event_type, ()) + (handler,)
+        if self._started:
+            self.start()
+
+    def wants(self, event_type: EventType) -> bool:
+        """Whether publishing ``event_type`` would reach any handler."""
+        return event_type in self.subscribers
 
     def publish(self, event: Event) -> None:
         """Publish an event. If queue is full, log warning and drop oldest event."""
-        try:
-            self._queue.put_nowait(event)
-        except asyncio.QueueFull:
-            # Queue is full - apply backpressure by dropping oldest event
+        if event.type not in self.subscribers:
+            return  # nobody is listening; don't queue it just to discard it
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            # Queue is full - the append below drops the oldest event
             self._dropped_events += 1
             if self._dropped_events == 1 or self._dropped_events % 100 == 0:
-                self.logger.warning(
+                logger.warning(
                     "Event queue full, dropped %d events (latest: %s)",
                     self._dropped_events,
                     event.type.name,
                 )
-            try:
-                # Remove oldest event to make room
-                self._queue.get_nowait()
-                self._queue.task_done()
-                self._queue.put_nowait(event)
-            except (asyncio.QueueEmpty, asyncio.QueueFull):
-                pass  # Race condition, just drop the event
+        queue.append(event)
+        self._not_empty.set()
 
     async def _process_events(self) -> None:
+        queue = self._queue
         while True:
-            event = await self._queue.get()
-            handlers = self.subscribers.get(event.type, [])
-            for handler in handlers:
-                try:
-                    await handler(event)
-                except Exception as e:
-                    self.logger.error("Error handling event %s: %s", event.type, e)
-            self._queue.task_done()
+            await self._not_empty.wait()
+            # Cleared before draining: anything published from here on sets
+            # it again, so no wakeup is lost.
+            self._not_empty.clear()
+            # Drain up to a batch per wakeup, then yield so a burst of events
+            # cannot starve the other tasks on the loop.
+            for _ in range(min(len(queue), EVENT_DRAIN_BATCH)):
+                await self._dispatch(queue.popleft())
+            if queue:
+                self._not_empty.set()
+                await asyncio.sleep(0)
+
+    async def _dispatch(self, event: Event) -> None:
+        handlers = self.subscribers.get(event.type, ())
+        if len(handlers) == 1:
+            try:
+                await handlers[0](event)
+            except Exception as e:
+                logger.error("Error handling event %s: %s", event.type.name, e)
+        elif handlers:
+            # Handlers are independent; let slow ones overlap instead of
+            # making each wait for the previous one.
+            results = await asyncio.gather(
+                *(handler(event) for handler in handlers), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Error handling event %s: %s", event.type.name, result)
+                elif isinstance(result, BaseException):
+                    # Same as the single-handler path: only Exceptions are
+                    # contained; cancellation and the like propagate.
+                    raise result
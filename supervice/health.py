@@ -1,16 +1,20 @@
 """Health check implementations for process monitoring."""
 
 import asyncio
+import shlex
+import shutil
 import socket
+import time
 from abc import ABC, abstractmethod
 
-from supervice.logger import get_logger
 from supervice.models import HealthCheckConfig, HealthCheckType
 
 
 class HealthCheckResult:
     """Result of a health check execution."""
 
+    __slots__ = ("healthy", "message")
+
     def __init__(self, healthy: bool, message: str = ""):
         self.healthy = healthy
         self.message = message
@@ -23,10 +27,11 @@ class HealthCheckResult:
 class HealthChecker(ABC):
     """Abstract base class for health checkers."""
 
+    __slots__ = ("config", "user")
+
     def __init__(self, config: HealthCheckConfig, user: str | None = None):
         self.config = config
         self.user = user
-        self.logger = get_logger()
 
     @abstractmethod
     async def check(self) -> HealthCheckResult:
@@ -34,9 +39,59 @@ class HealthChecker(ABC):
         pass
 
 
+# Resolved addresses for TCP health check hosts, reused for this long so a
+# probe every few seconds does not hit the resolver (or DNS) every time.
+_ADDR_CACHE_TTL = 60.0
+_addr_cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+
+def _is_ip_literal(host: str) -> bool:
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except OSError:
+            pass
+    return False
+
+
+async def _resolve(host: str, port: int) -> list[str]:
+    """Return the addresses to try for ``host``, resolving at most once per TTL."""
+    if _is_ip_literal(host):
+        return [host]
+    now = time.monotonic()
+    cached = _addr_cache.get((host, port))
+    if cached is not None and now - cached[0] < _ADDR_CACHE_TTL:
+        return cached[1]
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addrs = list(dict.fromkeys(str(info[4][0]) for info in infos))
+    _addr_cache[(host, port)] = (now, addrs)
+    return addrs
+
+
+async def _open_tcp(host: str, port: int) -> asyncio.StreamWriter:
+    """Connect to the first reachable address of ``host``."""
+    last_error: OSError | None = None
+    for addr in await _resolve(host, port):
+        try:
+            _, writer = await asyncio.open_connection(addr, port)
+            return writer
+        except OSError as e:
+            last_error = e
+    assert last_error is not None  # getaddrinfo never returns an empty list
+    raise last_error
+
+
 class TCPHealthChecker(HealthChecker):
     """Health checker that verifies TCP connectivity to a port."""
 
+    __slots__ = ("_ok_message",)
+
+    def __init__(self, config: HealthCheckConfig, user: str | None = None):
+        super().__init__(config, user)
+        # The passing result is the same every probe; build its message once.
+        self._ok_message = "TCP connection to %s:%s succeeded" % (config.host, config.port)
+
     async def check(self) -> HealthCheckResult:
         if self.config.port is None:
             return HealthCheckResult(False, "No port configured for TCP health check")
@@ -45,15 +100,10 @@ class TCPHealthChecker(HealthChecker):
         port = self.config.port
         timeout = self.config.timeout
 
-        loop = asyncio.get_event_loop()
         try:
-            # The context manager guarantees the socket is closed on every exit
-            # path — including a bare Exception or CancelledError propagating out
-            # (cancellation is a BaseException and would otherwise leak the fd).
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.setblocking(False)
-                await asyncio.wait_for(loop.sock_connect(sock, (host, port)), timeout=timeout)
-            return HealthCheckResult(True, "TCP connection to %s:%d succeeded" % (host, port))
+            # open_connection closes its socket itself if the connect fails or
+            # is cancelled, so no exit path can leak the fd.
+            writer = await asyncio.wait_for(_open_tcp(host, port), timeout=timeout)
         except asyncio.TimeoutError:
             return HealthCheckResult(
                 False, "TCP connection to %s:%d timed out after %ds" % (host, port, timeout)
@@ -65,10 +115,43 @@ class TCPHealthChecker(HealthChecker):
         except Exception as e:
             return HealthCheckResult(False, "TCP health check error: %s" % e)
 
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return HealthCheckResult(True, self._ok_message)
+
+
+# Anything the shell would interpret; commands containing one of these keep
+# running through /bin/sh so their meaning does not change.
+_SHELL_CHARS = frozenset(";|&$`<>*?[]{}()~#!\\\n")
+
+
+def _direct_argv(command: str) -> list[str] | None:
+    """Return argv for ``command`` if it can be exec'd without a shell."""
+    if any(c in _SHELL_CHARS for c in command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # Builtins (``exit 1``) and leading assignments (``FOO=1 cmd``) need sh.
+    if not argv or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
 
 class ScriptHealthChecker(HealthChecker):
     """Health checker that runs a script and checks exit code."""
 
+    __slots__ = ("_argv",)
+
+    def __init__(self, config: HealthCheckConfig, user: str | None = None):
+        super().__init__(config, user)
+        # Plain commands skip the extra sh fork+exec on every probe.
+        self._argv = _direct_argv(config.command) if config.command else None
+
     async def check(self) -> HealthCheckResult:
         if not self.config.command:
             return HealthCheckResult(False, "No command configured for script health check")
@@ -83,21 +166,31 @@ class ScriptHealthChecker(HealthChecker):
             kwargs: dict[str, str] = {}
             if self.user:
                 kwargs["user"] = self.user
-            proc = await asyncio.create_subprocess_shell(
-                self.config.command,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.PIPE,
-                **kwargs,  # type: ignore[arg-type]
-            )
+            if self._argv is not None:
+                proc = await asyncio.create_subprocess_exec(
+                    *self._argv,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    **kwargs,  # type: ignore[arg-type]
+                )
+            else:
+                proc = await asyncio.create_subprocess_shell(
+                    self.config.command,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    **kwargs,  # type: ignore[arg-type]
+                )
 
             try:
+                # communicate() drains stderr while waiting: a script that
+                # fills the pipe would otherwise block and never exit.
                 _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+                return_code = proc.returncode if proc.returncode is not None else -1
 
-                if proc.returncode == 0:
+                if return_code == 0:
                     return HealthCheckResult(True, "Health check script exited with code 0")
                 else:
                     stderr_msg = stderr.decode("utf-8", errors="replace").strip() if stderr else ""
-                    return_code = proc.returncode if proc.returncode is not None else -1
                     return HealthCheckResult(
                         False,
                         "Health check script exited with code %d%s"
@@ -106,7 +199,8 @@ class ScriptHealthChecker(HealthChecker):
             except asyncio.TimeoutError:
                 proc.kill()
                 try:
-                    await proc.wait()
+                    # Keep draining until EOF; wait() alone stalls on a full pipe.
+                    await proc.communicate()
                 except Exception:
                     pass
                 return HealthCheckResult(
@@ -116,12 +210,15 @@ class ScriptHealthChecker(HealthChecker):
             return HealthCheckResult(False, "Health check script error: %s" % e)
 
 
+_CHECKERS: dict[HealthCheckType, type[HealthChecker]] = {
+    HealthCheckType.TCP: TCPHealthChecker,
+    HealthCheckType.SCRIPT: ScriptHealthChecker,
+}
+
+
 def create_health_checker(
     config: HealthCheckConfig, user: str | None = None
 ) -> HealthChecker | None:
     """Factory function to create the appropriate health checker."""
-    if config.type == HealthCheckType.TCP:
-        return TCPHealthChecker(config, user)
-    elif config.type == HealthCheckType.SCRIPT:
-        return ScriptHealthChecker(config, user)
-    return None
+    checker_class = _CHECKERS.get(config.type)
+    return checker_class(config, user) if checker_class is not None else None
@@ -29,6 +29,21 @@ def _daemonize() -> None:
         os.close(devnull)
 
 
+def _use_pidfd_child_watcher() -> None:
+    """Reap children through pidfds instead of a waitpid thread per child.
+
+    Python 3.12+ already defaults to this where the kernel supports it.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        # Kernel older than 5.3, or pidfd_open blocked by a seccomp profile.
+        return
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Supervice: A modern process supervisor")
     parser.add_argument(
@@ -77,6 +92,8 @@ def main() -> None:
     if not args.nodaemon:
         _daemonize()
 
+    _use_pidfd_child_watcher()
+
     try:
         asyncio.run(supervisor.run())
     except KeyboardInterrupt:
@@ -28,7 +28,7 @@ class HealthCheckType(Enum):
     SCRIPT = "script"
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthCheckConfig:
     """Configuration for process health checks."""
 
@@ -44,7 +44,7 @@ class HealthCheckConfig:
     command: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramConfig:
     name: str
     command: str
@@ -72,7 +72,7 @@ class ProgramConfig:
     healthcheck: HealthCheckConfig = field(default_factory=HealthCheckConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class SupervisorConfig:
     # Empty logfile means: log to stdout in foreground mode; daemon mode falls
     # back to supervice.log (with a warning) since stdout is closed.
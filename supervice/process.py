@@ -1,5 +1,6 @@
 import asyncio
 import ctypes
+import functools
 import os
 import pwd
 import shlex
@@ -9,11 +10,14 @@ import sys
 import time
 from asyncio import subprocess
 
+from supervice.config import SIGNAL_NUMBERS
 from supervice.events import Event, EventBus, EventType
 from supervice.health import HealthChecker, create_health_checker
 from supervice.logger import get_logger
 from supervice.models import HealthCheckType, ProgramConfig
 
+logger = get_logger()
+
 # Process States
 STOPPED = "STOPPED"
 STARTING = "STARTING"
@@ -50,6 +54,12 @@ _STATE_EVENTS = {
 }
 
 
+@functools.lru_cache(maxsize=256)
+def _split_command(command: str) -> tuple[str, ...]:
+    """Tokenize a program command; a restart loop re-uses the parsed argv."""
+    return tuple(shlex.split(command))
+
+
 class ProcessStartError(Exception):
     """An explicit start request ended in FATAL."""
 
@@ -132,16 +142,22 @@ class Process:
         self.process: subprocess.Process | None = None
         self.backoff = 0
         self.stop_event = asyncio.Event()
-        self.logger = get_logger()
         self._task: asyncio.Task[None] | None = None
         self.event_bus = event_bus
         self.should_run = config.autostart
         # Serializes individual state transitions; transition *sequences* are
         # kept coherent by the ownership rules documented on each method.
         self._state_lock = asyncio.Lock()
-        # Set on every transition; waiters clear before re-checking state so no
-        # edge is lost. Never cleared by the setter.
-        self._state_changed = asyncio.Event()
+        # Notified on every transition. Shares _state_lock, so a waiter checks
+        # its predicate and starts waiting atomically and cannot miss an edge.
+        self._state_cond = asyncio.Condition(self._state_lock)
+        # Wakes an idle supervise() loop: set on every transition and when a
+        # start is requested. Only supervise() clears it.
+        self._wakeup = asyncio.Event()
+        # True while kill() is waiting for the child; kill() then settles the
+        # state itself so its caller can follow up (e.g. with BACKOFF) before
+        # supervise() sees the process as stopped.
+        self._killing = False
         # Health check state
         self._health_checker: HealthChecker | None = create_health_checker(
             config.healthcheck, user=config.user
@@ -159,6 +175,8 @@ class Process:
         # restarted indefinitely (with 1s pacing) under autorestart.
         self._reached_running = False
         self._log_tasks: list[asyncio.Task[None]] = []
+        # Child environment, merged on first spawn and reused by restarts.
+        self._env: dict[str, str] | None = None
 
     # ------------------------------------------------------------------ state
 
@@ -166,11 +184,12 @@ class Process:
         """Perform a transition. Caller must hold _state_lock."""
         old_state = self.state
         self.state = new_state
-        self._state_changed.set()
+        self._state_cond.notify_all()
+        self._wakeup.set()
         if new_state == old_state:
             return  # idempotent transition; wake waiters but publish nothing
         event_type = _STATE_EVENTS.get(new_state)
-        if event_type:
+        if event_type and self.event_bus.wants(event_type):
             payload = {
                 "processname": self.config.name,
                 "groupname": self.config.group or self.config.name,
@@ -183,6 +202,16 @@ class Process:
         async with self._state_lock:
             self._set_state_locked(new_state)
 
+    async def _wait_for_state(self, states: tuple[str, ...], timeout: float) -> None:
+        """Wait until the state is one of ``states``, or ``timeout`` elapses."""
+        async with self._state_cond:
+            try:
+                await asyncio.wait_for(
+                    self._state_cond.wait_for(lambda: self.state in states), timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+
     def update_config(self, new_config: ProgramConfig) -> None:
         """Swap in a new configuration; takes full effect at the next spawn.
 
@@ -190,6 +219,7 @@ class Process:
         keeps its captured settings until the process is restarted.
         """
         self.config = new_config
+        self._env = None
         self._health_checker = create_health_checker(
             new_config.healthcheck, user=new_config.user
         )
@@ -231,6 +261,7 @@ class Process:
             if self.state == RUNNING:
                 return RUNNING
             self.should_run = True
+            self._wakeup.set()
             self.backoff = 0
             self._health_restarts = 0
             # Clear terminal/waiting states left over from a previous run so
@@ -239,23 +270,10 @@ class Process:
             if self.state in (FATAL, EXITED, BACKOFF):
                 self._set_state_locked(STOPPED)
 
-        loop = asyncio.get_running_loop()
-        deadline = loop.time() + max(5.0, self.config.startsecs + 5.0)
-        while True:
-            self._state_changed.clear()
-            if self.state == RUNNING:
-                return RUNNING
-            if self.state == FATAL:
-                raise ProcessStartError(
-                    "%s failed to start (state: FATAL)" % self.config.name
-                )
-            remaining = deadline - loop.time()
-            if remaining <= 0:
-                return self.state
-            try:
-                await asyncio.wait_for(self._state_changed.wait(), timeout=remaining)
-            except asyncio.TimeoutError:
-                return self.state
+        await self._wait_for_state((RUNNING, FATAL), max(5.0, self.config.startsecs + 5.0))
+        if self.state == FATAL:
+            raise ProcessStartError("%s failed to start (state: FATAL)" % self.config.name)
+        return self.state
 
     async def stop_process(self) -> str:
         """Request a stop (RPC). Returns the settled state.
@@ -277,25 +295,17 @@ class Process:
         # If a spawn was in flight when the stop landed, kill() had nothing to
         # signal yet; spawn's own stop-recheck will kill the child and settle
         # the state. Wait for that instead of reporting success early.
-        loop = asyncio.get_running_loop()
-        deadline = loop.time() + self.config.stopwaitsecs + 7.0
-        while True:
-            self._state_changed.clear()
-            if self.state in (STOPPED, EXITED, FATAL):
-                return self.state
-            remaining = deadline - loop.time()
-            if remaining <= 0:
-                return self.state
-            try:
-                await asyncio.wait_for(self._state_changed.wait(), timeout=remaining)
-            except asyncio.TimeoutError:
-                return self.state
+        await self._wait_for_state((STOPPED, EXITED, FATAL), self.config.stopwaitsecs + 7.0)
+        return self.state
 
     # ------------------------------------------------------------ supervision
 
     async def supervise(self) -> None:
         """Main supervision loop. Sole owner of respawn/backoff decisions."""
         while not self.stop_event.is_set():
+            # Cleared before the checks below so a change made while they run
+            # is not lost.
+            self._wakeup.clear()
             try:
                 # Normalize: a cancelled retry (stop while in BACKOFF) settles
                 # to STOPPED no matter which path cancelled it.
@@ -305,7 +315,7 @@ class Process:
                 if self.should_run and self.state in (STOPPED, EXITED, FATAL, BACKOFF):
                     if self.state == BACKOFF:
                         delay = min(max(self.backoff, 1), MAX_BACKOFF_DELAY)
-                        self.logger.info("Backoff %s: waiting %ds", self.config.name, delay)
+                        logger.info("Backoff %s: waiting %ds", self.config.name, delay)
                         try:
                             await asyncio.wait_for(self.stop_event.wait(), timeout=delay)
                             continue
@@ -326,7 +336,7 @@ class Process:
                                 else:
                                     self.backoff += 1
                                     if self.backoff > self.config.startretries:
-                                        self.logger.error(
+                                        logger.error(
                                             "%s: giving up after %d failed start attempts",
                                             self.config.name,
                                             self.backoff,
@@ -344,7 +354,7 @@ class Process:
             except Exception:
                 # Safety net: supervision must never die silently. Mark the
                 # process FATAL (visible + alertable) instead of freezing it.
-                self.logger.critical(
+                logger.critical(
                     "Supervision error for %s; marking FATAL",
                     self.config.name,
                     exc_info=True,
@@ -355,17 +365,14 @@ class Process:
                 except Exception:
                     pass
 
-            try:
-                await asyncio.wait_for(self.stop_event.wait(), timeout=0.1)
-            except asyncio.TimeoutError:
-                pass
+            await self._wait_idle()
 
         if self.process and self.process.returncode is None:
             await self.kill()
 
     async def spawn(self) -> None:
         await self._change_state(STARTING)
-        self.logger.info("Spawning %s", self.config.name)
+        logger.info("Spawning %s", self.config.name)
         self._reached_running = False
 
         stdout_writer: _ChildLogWriter | None = None
@@ -373,7 +380,7 @@ class Process:
         self._log_tasks = []
 
         try:
-            args = shlex.split(self.config.command)
+            args = _split_command(self.config.command)
             if not args:
                 raise ValueError("empty command")
             program = args[0]
@@ -393,7 +400,7 @@ class Process:
                 try:
                     pw = pwd.getpwnam(self.config.user)
                 except KeyError:
-                    self.logger.error(
+                    logger.error(
                         "%s failed: user '%s' not found", self.config.name, self.config.user
                     )
                     await self._change_state(FATAL)
@@ -422,6 +429,9 @@ class Process:
                 )
                 stderr_dest = subprocess.PIPE
 
+            if self._env is None:
+                self._env = {**os.environ, **self.config.environment}
+
             preexec = None
             if self.config.pdeathsig and _LIBC is not None:
                 preexec = _pdeathsig_preexec
@@ -431,7 +441,7 @@ class Process:
                 *args[1:],
                 stdout=stdout_dest,
                 stderr=stderr_dest,
-                env={**os.environ, **self.config.environment},
+                env=self._env,
                 cwd=self.config.directory,
                 preexec_fn=preexec,
                 start_new_session=True,
@@ -452,7 +462,7 @@ class Process:
             # A stop request may have landed between the supervise loop's check
             # and the fork; honour it now instead of leaving the child running.
             if not self.should_run or self.stop_event.is_set():
-                self.logger.info(
+                logger.info(
                     "%s: stop requested during spawn; killing child", self.config.name
                 )
                 await self.kill()
@@ -470,7 +480,7 @@ class Process:
                 except asyncio.TimeoutError:
                     exited_early = False
                 if exited_early:
-                    self.logger.warning(
+                    logger.warning(
                         "%s exited before startsecs (%ds): start attempt failed",
                         self.config.name,
                         self.config.startsecs,
@@ -481,7 +491,7 @@ class Process:
             self.backoff = 0
             self._reached_running = True
             await self._change_state(RUNNING)
-            self.logger.info("Started %s (pid %d)", self.config.name, self.process.pid)
+            logger.info("Started %s (pid %d)", self.config.name, self.process.pid)
             self.started_at = time.time()
 
             await self._start_health_checks()
@@ -493,10 +503,10 @@ class Process:
             # else (EMFILE/EAGAIN, log dir briefly missing, binary mid-deploy)
             # is retried under the normal backoff/startretries policy.
             if isinstance(e, (ValueError, PermissionError)):
-                self.logger.error("%s failed permanently: %s", self.config.name, e)
+                logger.error("%s failed permanently: %s", self.config.name, e)
                 await self._change_state(FATAL)
             else:
-                self.logger.error(
+                logger.error(
                     "Failed to spawn %s (will retry): %s", self.config.name, e
                 )
                 await self._change_state(EXITED)
@@ -523,7 +533,7 @@ class Process:
         except asyncio.CancelledError:
             raise
         except Exception as e:
-            self.logger.error("%s: log writer error: %s", self.config.name, e)
+            logger.error("%s: log writer error: %s", self.config.name, e)
         finally:
             writer.close()
 
@@ -538,14 +548,29 @@ class Process:
             return
 
         return_code = await self.process.wait()
-        self.logger.info("%s exited with code %d", self.config.name, return_code)
+        logger.info("%s exited with code %d", self.config.name, return_code)
 
         async with self._state_lock:
             if self.state in (STOPPING, STOPPED):
-                self._set_state_locked(STOPPED)
+                if not self._killing:
+                    self._set_state_locked(STOPPED)
                 return
             self._set_state_locked(EXITED)
 
+    async def _wait_idle(self) -> None:
+        """Sleep until a transition, a start request, or a stop."""
+        if self._wakeup.is_set() or self.stop_event.is_set():
+            return
+        waiters = (
+            asyncio.ensure_future(self._wakeup.wait()),
+            asyncio.ensure_future(self.stop_event.wait()),
+        )
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
     # ---------------------------------------------------------- health checks
 
     async def _run_health_checks(self) -> None:
@@ -555,9 +580,15 @@ class Process:
             return
 
         hc_config = self.config.healthcheck
+        # Each run gets its own health task, so the child is fixed for its
+        # life; captured before start_period so a task that outlives its run
+        # stops at the dead child instead of probing the next one.
+        child = self.process
+        if child is None:
+            return
 
         if hc_config.start_period > 0:
-            self.logger.debug(
+            logger.debug(
                 "%s: waiting %ds before starting health checks",
                 self.config.name,
                 hc_config.start_period,
@@ -565,13 +596,13 @@ class Process:
             await asyncio.sleep(hc_config.start_period)
 
         running_states = (RUNNING, UNHEALTHY)
-        while self.state in running_states and self.process and self.process.returncode is None:
+        while self.state in running_states and child.returncode is None:
             try:
                 result = await checker.check()
 
                 if result.healthy:
                     if self._health_failures > 0:
-                        self.logger.info(
+                        logger.info(
                             "%s: health check passed after %d failures",
                             self.config.name,
                             self._health_failures,
@@ -583,19 +614,20 @@ class Process:
                     if self.state == UNHEALTHY:
                         await self._change_state(RUNNING)
 
-                    self.event_bus.publish(
-                        Event(
-                            type=EventType.HEALTHCHECK_PASSED,
-                            payload={
-                                "processname": self.config.name,
-                                "message": result.message,
-                                "pid": self.process.pid if self.process else None,
-                            },
+                    if self.event_bus.wants(EventType.HEALTHCHECK_PASSED):
+                        self.event_bus.publish(
+                            Event(
+                                type=EventType.HEALTHCHECK_PASSED,
+                                payload={
+                                    "processname": self.config.name,
+                                    "message": result.message,
+                                    "pid": child.pid,
+                                },
+                            )
                         )
-                    )
                 else:
                     self._health_failures += 1
-                    self.logger.warning(
+                    logger.warning(
                         "%s: health check failed (%d/%d): %s",
                         self.config.name,
                         self._health_failures,
@@ -603,21 +635,22 @@ class Process:
                         result.message,
                     )
 
-                    self.event_bus.publish(
-                        Event(
-                            type=EventType.HEALTHCHECK_FAILED,
-                            payload={
-                                "processname": self.config.name,
-                                "message": result.message,
-                                "failures": self._health_failures,
-                                "pid": self.process.pid if self.process else None,
-                            },
+                    if self.event_bus.wants(EventType.HEALTHCHECK_FAILED):
+                        self.event_bus.publish(
+                            Event(
+                                type=EventType.HEALTHCHECK_FAILED,
+                                payload={
+                                    "processname": self.config.name,
+                                    "message": result.message,
+                                    "failures": self._health_failures,
+                                    "pid": child.pid,
+                                },
+                            )
                         )
-                    )
 
                     if self._health_failures >= hc_config.retries:
                         self.is_healthy = False
-                        self.logger.error(
+                        logger.error(
                             "%s: health check failed %d times, marking as unhealthy",
                             self.config.name,
                             self._health_failures,
@@ -632,7 +665,7 @@ class Process:
                             if self._health_restarts > self.config.startretries:
                                 # Bounded: persistent unhealthiness must not
                                 # become an endless kill/respawn cycle.
-                                self.logger.error(
+                                logger.error(
                                     "%s: still unhealthy after %d health-triggered "
                                     "restarts; giving up (FATAL)",
                                     self.config.name,
@@ -643,7 +676,7 @@ class Process:
                                 await self.kill()
                                 await self._change_state(FATAL)
                             else:
-                                self.logger.info(
+                                logger.info(
                                     "%s: restarting due to health check failures "
                                     "(restart %d/%d)",
                                     self.config.name,
@@ -660,7 +693,7 @@ class Process:
             except asyncio.CancelledError:
                 raise
             except Exception as e:
-                self.logger.error("%s: health check error: %s", self.config.name, e)
+                logger.error("%s: health check error: %s", self.config.name, e)
 
             await asyncio.sleep(hc_config.interval)
 
@@ -708,7 +741,7 @@ class Process:
         try:
             await asyncio.wait_for(self.process.wait(), timeout=2)
         except asyncio.TimeoutError:
-            self.logger.critical(
+            logger.critical(
                 "%s: process group did not die after SIGKILL; leaving state STOPPING",
                 self.config.name,
             )
@@ -723,27 +756,31 @@ class Process:
             return
 
         await self._change_state(STOPPING)
-        self.logger.info("Stopping %s", self.config.name)
+        logger.info("Stopping %s", self.config.name)
 
-        sig = getattr(signal, "SIG%s" % self.config.stopsignal, signal.SIGTERM)
+        sig = SIGNAL_NUMBERS.get(self.config.stopsignal.upper(), signal.SIGTERM)
         self._signal_group(sig)
 
+        self._killing = True
         try:
-            await asyncio.wait_for(self.process.wait(), timeout=self.config.stopwaitsecs)
-        except asyncio.TimeoutError:
-            self.logger.warning("%s did not stop, killing process group", self.config.name)
-            self._signal_group(signal.SIGKILL)
             try:
-                await asyncio.wait_for(self.process.wait(), timeout=2)
+                await asyncio.wait_for(self.process.wait(), timeout=self.config.stopwaitsecs)
             except asyncio.TimeoutError:
-                # Unkillable (e.g. uninterruptible D-state). Claiming STOPPED
-                # here would let a duplicate instance be started; stay STOPPING
-                # until the exit is actually observed (wait() finishes the
-                # sequence whenever the process finally dies).
-                self.logger.critical(
-                    "%s: process group did not die after SIGKILL; leaving state STOPPING",
-                    self.config.name,
-                )
-                return
+                logger.warning("%s did not stop, killing process group", self.config.name)
+                self._signal_group(signal.SIGKILL)
+                try:
+                    await asyncio.wait_for(self.process.wait(), timeout=2)
+                except asyncio.TimeoutError:
+                    # Unkillable (e.g. uninterruptible D-state). Claiming STOPPED
+                    # here would let a duplicate instance be started; stay STOPPING
+                    # until the exit is actually observed (wait() finishes the
+                    # sequence whenever the process finally dies).
+                    logger.critical(
+                        "%s: process group did not die after SIGKILL; leaving state STOPPING",
+                        self.config.name,
+                    )
+                    return
+        finally:
+            self._killing = False
 
         await self._change_state(STOPPED)
@@ -5,14 +5,21 @@ import os
 import stat
 import struct
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from supervice.logger import get_logger
 from supervice.process import ProcessStartError
 
+logger = get_logger()
+
 # Length-prefixed protocol constants
 HEADER_SIZE = 4  # 4 bytes for message length (uint32, big-endian)
 MAX_MESSAGE_SIZE = 1024 * 1024  # 1MB max message size
+_HDR = struct.Struct(">I")
+
+# Compact separators: the wire format carries no insignificant whitespace.
+_encode_json = json.JSONEncoder(separators=(",", ":")).encode
 
 # States in which a process is considered "down" after a stop request.
 _DOWN_STATES = ("STOPPED", "EXITED", "FATAL")
@@ -35,8 +42,20 @@ class RPCServer:
     def __init__(self, socket_path: str, supervisor: Any):
         self.socket_path = socket_path
         self.supervisor = supervisor
-        self.logger = get_logger()
         self.server: asyncio.AbstractServer | None = None
+        # Open client connections, closed on stop() so a client holding its
+        # connection cannot keep the server's wait_closed() pending.
+        self._clients: set[asyncio.StreamWriter] = set()
+        # Bound once; keys mirror VALID_COMMANDS.
+        self._handlers: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+            "status": self._cmd_status,
+            "start": self._cmd_start,
+            "stop": self._cmd_stop,
+            "restart": self._cmd_restart,
+            "startgroup": self._cmd_startgroup,
+            "stopgroup": self._cmd_stopgroup,
+            "reload": self._cmd_reload,
+        }
 
     async def _probe_socket(self) -> str:
         """Classify an existing socket path: 'alive', 'stale', or 'unknown'.
@@ -57,10 +76,10 @@ class RPCServer:
                 return "stale"
             return "unknown"
         try:
-            request = json.dumps({"command": "status"}).encode("utf-8")
+            request = _encode_json({"command": "status"}).encode("utf-8")
             await self._write_message(writer, request)
-            data = await asyncio.wait_for(self._read_message(reader), timeout=2.0)
-            return "alive" if data is not None else "unknown"
+            await asyncio.wait_for(self._read_message(reader), timeout=2.0)
+            return "alive"
         except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
             return "unknown"
         finally:
@@ -75,7 +94,7 @@ class RPCServer:
         try:
             dir_mode = os.stat(sock_dir).st_mode
             if dir_mode & stat.S_IWOTH:
-                self.logger.warning(
+                logger.warning(
                     "Socket directory %s is world-writable; another local user could "
                     "pre-create %s to block startup or impersonate the daemon. "
                     "Configure 'socket' to a private directory.",
@@ -89,7 +108,7 @@ class RPCServer:
             probe = await self._probe_socket()
             if probe == "alive":
                 msg = "Another supervice instance is already listening on %s" % self.socket_path
-                self.logger.critical(msg)
+                logger.critical(msg)
                 raise RuntimeError(msg)
             if probe == "unknown":
                 msg = (
@@ -97,13 +116,15 @@ class RPCServer:
                     "replace it. Remove it manually if no supervice instance is running."
                     % self.socket_path
                 )
-                self.logger.critical(msg)
+                logger.critical(msg)
                 raise RuntimeError(msg)
             try:
                 os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass  # went away on its own since the probe
             except OSError as e:
                 msg = "Cannot remove stale socket %s: %s" % (self.socket_path, e)
-                self.logger.critical(msg)
+                logger.critical(msg)
                 raise RuntimeError(msg) from e
 
         # Security: Set umask to create socket with restrictive permissions atomically
@@ -114,20 +135,24 @@ class RPCServer:
         finally:
             os.umask(old_umask)
 
-        self.logger.info("RPC Server listening on %s", self.socket_path)
+        logger.info("RPC Server listening on %s", self.socket_path)
 
     async def stop(self) -> None:
         if self.server:
             self.server.close()
+            for writer in list(self._clients):
+                writer.close()
             await self.server.wait_closed()
-            if os.path.exists(self.socket_path):
+            try:
                 os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
 
-    async def _read_message(self, reader: asyncio.StreamReader) -> bytes | None:
+    async def _read_message(self, reader: asyncio.StreamReader) -> bytes:
         """Read a length-prefixed message from the stream."""
         header = await reader.readexactly(HEADER_SIZE)
 
-        msg_length = struct.unpack(">I", header)[0]
+        msg_length = _HDR.unpack(header)[0]
 
         if msg_length > MAX_MESSAGE_SIZE:
             msg = "Message too large: %d bytes (max %d)" % (msg_length, MAX_MESSAGE_SIZE)
@@ -139,80 +164,90 @@ class RPCServer:
         # Read the message body
         return await reader.readexactly(msg_length)
 
+    def _queue_message(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        """Buffer a length-prefixed message on the stream without draining."""
+        header = _HDR.pack(len(data))
+        # writelines hands both buffers to the transport (one sendmsg() on
+        # Python 3.12+) instead of copying a large reply into header + data.
+        writer.writelines((header, data))
+
     async def _write_message(self, writer: asyncio.StreamWriter, data: bytes) -> None:
         """Write a length-prefixed message to the stream."""
-        header = struct.pack(">I", len(data))
-        writer.write(header + data)
+        self._queue_message(writer, data)
         await writer.drain()
 
+    async def _handle_frame(self, data: bytes) -> dict[str, Any]:
+        """Decode and validate one request body, then run it."""
+        # A zero-length body is a valid frame but not valid JSON; report it
+        # clearly instead of surfacing a confusing JSONDecodeError.
+        if not data:
+            return {
+                "status": "error",
+                "code": "EMPTY_REQUEST",
+                "message": "Empty request",
+            }
+
+        # Parse JSON with proper error handling
+        try:
+            # json.loads detects UTF-8 on bytes itself; no intermediate str.
+            request = json.loads(data)
+        except json.JSONDecodeError as e:
+            logger.warning("Invalid JSON in RPC request: %s", e)
+            return {
+                "status": "error",
+                "code": "INVALID_JSON",
+                "message": "Invalid JSON: %s" % e,
+            }
+
+        # Validate request structure
+        if not isinstance(request, dict):
+            return {
+                "status": "error",
+                "code": "INVALID_REQUEST",
+                "message": "Request must be a JSON object",
+            }
+
+        # Validate command; the handler lookup doubles as the check
+        command = request.get("command")
+        handler = self._handlers.get(command)  # type: ignore[arg-type]
+        if handler is None:
+            logger.warning("Unknown RPC command: %s", command)
+            return {
+                "status": "error",
+                "code": "UNKNOWN_COMMAND",
+                "message": "Unknown command: %s" % command,
+            }
+
+        return await handler(request)
+
     async def handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ) -> None:
+        # Requests are answered in order until the client closes its end, so a
+        # poller can keep one connection instead of reconnecting every time.
+        self._clients.add(writer)
         try:
-            data = await self._read_message(reader)
-            if data is None:
-                return
-
-            # A zero-length body is a valid frame but not valid JSON; report it
-            # clearly instead of surfacing a confusing JSONDecodeError.
-            if not data:
-                response = {
-                    "status": "error",
-                    "code": "EMPTY_REQUEST",
-                    "message": "Empty request",
-                }
-                await self._write_message(writer, json.dumps(response).encode("utf-8"))
-                return
-
-            # Parse JSON with proper error handling
-            try:
-                request = json.loads(data.decode("utf-8"))
-            except json.JSONDecodeError as e:
-                self.logger.warning("Invalid JSON in RPC request: %s", e)
-                response = {
-                    "status": "error",
-                    "code": "INVALID_JSON",
-                    "message": "Invalid JSON: %s" % e,
-                }
-                await self._write_message(writer, json.dumps(response).encode("utf-8"))
-                return
-
-            # Validate request structure
-            if not isinstance(request, dict):
-                response = {
-                    "status": "error",
-                    "code": "INVALID_REQUEST",
-                    "message": "Request must be a JSON object",
-                }
-                await self._write_message(writer, json.dumps(response).encode("utf-8"))
-                return
-
-            # Validate command
-            command = request.get("command")
-            if command not in VALID_COMMANDS:
-                self.logger.warning("Unknown RPC command: %s", command)
-                response = {
-                    "status": "error",
-                    "code": "UNKNOWN_COMMAND",
-                    "message": "Unknown command: %s" % command,
-                }
-                await self._write_message(writer, json.dumps(response).encode("utf-8"))
-                return
-
-            response = await self.process_request(request)
-            await self._write_message(writer, json.dumps(response).encode("utf-8"))
+            while True:
+                try:
+                    data = await self._read_message(reader)
+                except asyncio.IncompleteReadError as e:
+                    if e.partial:
+                        # Client disconnected mid-message
+                        logger.debug("Client disconnected during read")
+                    return
+                response = await self._handle_frame(data)
+                await self._write_message(writer, _encode_json(response).encode("utf-8"))
 
-        except asyncio.IncompleteReadError:
-            # Client disconnected mid-message
-            self.logger.debug("Client disconnected during read")
         except Exception as e:
-            self.logger.error("RPC Error: %s", e)
+            logger.error("RPC Error: %s", e)
             try:
                 error_response = {"status": "error", "code": "INTERNAL_ERROR", "message": str(e)}
-                await self._write_message(writer, json.dumps(error_response).encode("utf-8"))
+                self._queue_message(writer, _encode_json(error_response).encode("utf-8"))
             except Exception:
                 pass  # Client may have disconnected
         finally:
+            self._clients.discard(writer)
+            # Closing the transport flushes anything still queued.
             writer.close()
             await writer.wait_closed()
 
@@ -244,105 +279,106 @@ class RPCServer:
         }
 
     async def process_request(self, request: dict[str, Any]) -> dict[str, Any]:
-        command = request.get("command")
-
-        if command == "status":
-            now = time.time()
-            processes = []
-            for name, proc in self.supervisor.processes.items():
-                is_alive = proc.process and proc.process.returncode is None
-                proc_info: dict[str, Any] = {
-                    "name": name,
-                    "state": proc.state,
-                    "pid": proc.process.pid if is_alive else None,
+        handler = self._handlers.get(request.get("command", ""))
+        if handler is None:
+            return {"status": "error", "message": "Unknown command"}
+        return await handler(request)
+
+    async def _cmd_status(self, request: dict[str, Any]) -> dict[str, Any]:
+        now = time.time()
+        processes: list[dict[str, Any]] = []
+        append = processes.append
+        for name, proc in self.supervisor.processes.items():
+            child = proc.process
+            is_alive = child is not None and child.returncode is None
+            proc_info: dict[str, Any] = {
+                "name": name,
+                "state": proc.state,
+                "pid": child.pid if is_alive else None,
+            }
+            started_at = proc.started_at
+            if started_at is not None and is_alive:
+                proc_info["uptime"] = max(0, int(now - started_at))
+            healthy = proc.is_healthy
+            if healthy is not None:
+                proc_info["healthy"] = healthy
+            append(proc_info)
+        return {"status": "ok", "processes": processes}
+
+    async def _cmd_stop(self, request: dict[str, Any]) -> dict[str, Any]:
+        name = request.get("name")
+        if name and name in self.supervisor.processes:
+            return await self._stop_one(name)
+        return {"status": "error", "message": "Process not found"}
+
+    async def _cmd_start(self, request: dict[str, Any]) -> dict[str, Any]:
+        name = request.get("name")
+        if name and name in self.supervisor.processes:
+            return await self._start_one(name)
+        return {"status": "error", "message": "Process not found"}
+
+    async def _cmd_restart(self, request: dict[str, Any]) -> dict[str, Any]:
+        name = request.get("name")
+        force = request.get("force", False)
+        if name and name in self.supervisor.processes:
+            proc = self.supervisor.processes[name]
+            if force:
+                await proc.force_kill()
+            else:
+                stop_result = await self._stop_one(name)
+                if stop_result["status"] != "ok":
+                    return stop_result
+            start_result = await self._start_one(name)
+            if start_result["status"] == "ok":
+                return {"status": "ok", "message": "Restarted %s" % name}
+            return start_result
+        return {"status": "error", "message": "Process not found"}
+
+    async def _cmd_stopgroup(self, request: dict[str, Any]) -> dict[str, Any]:
+        group = request.get("name")
+        if group and group in self.supervisor.groups:
+            names = [n for n in self.supervisor.groups[group] if n in self.supervisor.processes]
+            results = await asyncio.gather(
+                *(self._stop_one(n) for n in names), return_exceptions=True
+            )
+            failed = [
+                n
+                for n, r in zip(names, results, strict=True)
+                if isinstance(r, BaseException) or r.get("status") != "ok"
+            ]
+            if failed:
+                return {
+                    "status": "error",
+                    "message": "Stopped group %s, but failed for: %s"
+                    % (group, ", ".join(failed)),
                 }
-                if proc.started_at is not None and is_alive:
-                    proc_info["uptime"] = max(0, int(now - proc.started_at))
-                if proc.is_healthy is not None:
-                    proc_info["healthy"] = proc.is_healthy
-                processes.append(proc_info)
-            return {"status": "ok", "processes": processes}
-
-        elif command == "stop":
-            name = request.get("name")
-            if name and name in self.supervisor.processes:
-                return await self._stop_one(name)
-            return {"status": "error", "message": "Process not found"}
-
-        elif command == "start":
-            name = request.get("name")
-            if name and name in self.supervisor.processes:
-                return await self._start_one(name)
-            return {"status": "error", "message": "Process not found"}
-
-        elif command == "restart":
-            name = request.get("name")
-            force = request.get("force", False)
-            if name and name in self.supervisor.processes:
-                proc = self.supervisor.processes[name]
-                if force:
-                    await proc.force_kill()
-                else:
-                    stop_result = await self._stop_one(name)
-                    if stop_result["status"] != "ok":
-                        return stop_result
-                start_result = await self._start_one(name)
-                if start_result["status"] == "ok":
-                    return {"status": "ok", "message": "Restarted %s" % name}
-                return start_result
-            return {"status": "error", "message": "Process not found"}
-
-        elif command == "stopgroup":
-            group = request.get("name")
-            if group and group in self.supervisor.groups:
-                names = [
-                    n for n in self.supervisor.groups[group] if n in self.supervisor.processes
-                ]
-                results = await asyncio.gather(
-                    *(self._stop_one(n) for n in names), return_exceptions=True
-                )
-                failed = [
-                    n
-                    for n, r in zip(names, results, strict=True)
-                    if isinstance(r, BaseException) or r.get("status") != "ok"
-                ]
-                if failed:
-                    return {
-                        "status": "error",
-                        "message": "Stopped group %s, but failed for: %s"
-                        % (group, ", ".join(failed)),
-                    }
-                return {"status": "ok", "message": "Stopped group %s" % group}
-            return {"status": "error", "message": "Group not found"}
-
-        elif command == "startgroup":
-            group = request.get("name")
-            if group and group in self.supervisor.groups:
-                names = [
-                    n for n in self.supervisor.groups[group] if n in self.supervisor.processes
-                ]
-                results = await asyncio.gather(
-                    *(self._start_one(n) for n in names), return_exceptions=True
-                )
-                failed = [
-                    n
-                    for n, r in zip(names, results, strict=True)
-                    if isinstance(r, BaseException) or r.get("status") != "ok"
-                ]
-                if failed:
-                    return {
-                        "status": "error",
-                        "message": "Started group %s, but failed for: %s"
-                        % (group, ", ".join(failed)),
-                    }
-                return {"status": "ok", "message": "Started group %s" % group}
-            return {"status": "error", "message": "Group not found"}
-
-        elif command == "reload":
-            try:
-                result = await self.supervisor.reload_config()
-                return {"status": "ok", **result}
-            except Exception as e:
-                return {"status": "error", "message": "Reload failed: %s" % e}
+            return {"status": "ok", "message": "Stopped group %s" % group}
+        return {"status": "error", "message": "Group not found"}
+
+    async def _cmd_startgroup(self, request: dict[str, Any]) -> dict[str, Any]:
+        group = request.get("name")
+        if group and group in self.supervisor.groups:
+            names = [n for n in self.supervisor.groups[group] if n in self.supervisor.processes]
+            results = await asyncio.gather(
+                *(self._start_one(n) for n in names), return_exceptions=True
+            )
+            failed = [
+                n
+                for n, r in zip(names, results, strict=True)
+                if isinstance(r, BaseException) or r.get("status") != "ok"
+            ]
+            if failed:
+                return {
+                    "status": "error",
+                    "message": "Started group %s, but failed for: %s"
+                    % (group, ", ".join(failed)),
+                }
+            return {"status": "ok", "message": "Started group %s" % group}
+        return {"status": "error", "message": "Group not found"}
 
-        return {"status": "error", "message": "Unknown command"}
+    async def _cmd_reload(self, request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            result = await self.supervisor.reload_config()
+            return {"status": "ok", **result}
+        except Exception as e:
+            return {"status": "error", "message": "Reload failed: %s" % e}
@@ -0,0 +1,54 @@
+import unittest
+
+from supervice.client import _build_parser, _parse_args_fast
+
+
+class TestFastArgParsing(unittest.TestCase):
+    """The argparse-free fast path must agree with the full parser."""
+
+    def assert_same_as_argparse(self, argv: list[str]) -> None:
+        fast = _parse_args_fast(argv)
+        self.assertIsNotNone(fast, argv)
+        full = _build_parser().parse_args(argv)
+        for attr in ("socket", "timeout", "command"):
+            self.assertEqual(getattr(fast, attr), getattr(full, attr), argv)
+        self.assertEqual(fast.name, getattr(full, "name", None), argv)
+        self.assertEqual(fast.force, getattr(full, "force", False), argv)
+
+    def test_common_invocations_match_argparse(self) -> None:
+        for argv in (
+            ["status"],
+            ["reload"],
+            ["start", "web"],
+            ["stop", "worker:01"],
+            ["startgroup", "g1"],
+            ["stopgroup", "g1"],
+            ["restart", "web"],
+            ["restart", "--force", "web"],
+            ["restart", "web", "--force"],
+            ["-s", "/run/x.sock", "status"],
+            ["--socket=/run/x.sock", "--timeout", "2.5", "start", "web"],
+            ["--timeout=5", "-s", "a", "--socket", "b", "status"],
+        ):
+            self.assert_same_as_argparse(argv)
+
+    def test_other_invocations_fall_back_to_argparse(self) -> None:
+        for argv in (
+            [],
+            ["-h"],
+            ["status", "--help"],
+            ["start"],
+            ["start", "a", "b"],
+            ["stop", "--force", "web"],
+            ["--sock", "x", "status"],
+            ["-s=x", "status"],
+            ["-s"],
+            ["-s", "--timeout", "status"],
+            ["--timeout", "soon", "status"],
+            ["bogus"],
+        ):
+            self.assertIsNone(_parse_args_fast(argv), argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
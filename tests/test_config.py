@@ -2,7 +2,7 @@ import os
 import tempfile
 import unittest
 
-from supervice.config import _parse_bool, _parse_env, parse_config
+from supervice.config import ConfigValidationError, _parse_bool, _parse_env, parse_config
 from supervice.models import ProgramConfig, SupervisorConfig
 
 
@@ -46,6 +46,10 @@ class TestConfigParsing(unittest.TestCase):
 
         self.assertEqual(_parse_env(""), {})
 
+    def test_parse_env_quoted_values(self):
+        env = _parse_env('A="x, y", B=\'p=q\',C=, D="unterminated')
+        self.assertEqual(env, {"A": "x, y", "B": "p=q", "C": "", "D": "unterminated"})
+
     def test_parse_config_file(self):
         config_content = """
 [supervice]
@@ -81,6 +85,55 @@ programs=prog1
         finally:
             os.remove(fname)
 
+    def test_parse_config_groups_assign_members(self):
+        config_content = """
+[program:a]
+command=sleep 1
+
+[program:b]
+command=sleep 1
+
+[program:c]
+command=sleep 1
+
+[group:g1]
+programs=a, c
+
+[group:g2]
+programs=b
+"""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            f.write(config_content)
+            fname = f.name
+
+        try:
+            config = parse_config(fname)
+            groups = {prog.name: prog.group for prog in config.programs}
+            self.assertEqual(groups, {"a": "g1", "b": "g2", "c": "g1"})
+        finally:
+            os.remove(fname)
+
+    def test_reparse_unchanged_file_rechecks_directories(self):
+        workdir = tempfile.mkdtemp()
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            f.write("[program:a]\ncommand=sleep 1\ndirectory=%s\n" % workdir)
+            fname = f.name
+
+        try:
+            first = parse_config(fname)
+            second = parse_config(fname)
+            self.assertEqual(first, second)
+            self.assertIsNot(first.programs[0], second.programs[0])
+
+            # The file is unchanged, but the host is not.
+            os.rmdir(workdir)
+            with self.assertRaises(ConfigValidationError):
+                parse_config(fname)
+        finally:
+            os.remove(fname)
+            if os.path.isdir(workdir):
+                os.rmdir(workdir)
+
     def test_parse_config_missing_file(self):
         with self.assertRaises(FileNotFoundError):
             parse_config("nonexistent_file.conf")
@@ -2,7 +2,7 @@ import asyncio
 import os
 import tempfile
 import unittest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from supervice.core import Supervisor
 from supervice.events import Event, EventBus, EventType
@@ -33,6 +33,112 @@ class TestEventBus(unittest.TestCase):
 
         asyncio.run(run())
 
+    def test_consumer_starts_with_first_subscriber(self):
+        async def run():
+            bus = EventBus()
+            bus.start()
+            self.assertIsNone(bus._task)
+
+            # Unwanted events are not queued at all.
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {}))
+            self.assertEqual(len(bus._queue), 0)
+
+            received = []
+
+            async def handler(event):
+                received.append(event)
+
+            bus.subscribe(EventType.PROCESS_STATE_STARTING, handler)
+            self.assertIsNotNone(bus._task)
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {}))
+            await asyncio.sleep(0.05)
+            await bus.stop()
+            self.assertEqual(len(received), 1)
+
+        asyncio.run(run())
+
+    def test_handlers_run_concurrently_and_failures_are_isolated(self):
+        async def run():
+            bus = EventBus()
+            bus.start()
+            both_running = asyncio.Event()
+            entered = []
+
+            async def slow(event):
+                entered.append(event)
+                if len(entered) == 2:
+                    both_running.set()
+                await asyncio.wait_for(both_running.wait(), 1)
+
+            async def broken(event):
+                raise RuntimeError("boom")
+
+            for handler in (slow, broken, slow):
+                bus.subscribe(EventType.PROCESS_STATE_STARTING, handler)
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {}))
+            await asyncio.sleep(0.1)
+            await bus.stop()
+            # Neither slow handler waited for the other to finish.
+            self.assertTrue(both_running.is_set())
+
+        asyncio.run(run())
+
+    def test_cancelled_handler_propagates_with_one_or_many_handlers(self):
+        async def ok(event):
+            pass
+
+        async def cancelled(event):
+            raise asyncio.CancelledError
+
+        async def run():
+            for handlers in ((cancelled,), (ok, cancelled)):
+                bus = EventBus()
+                for handler in handlers:
+                    bus.subscribe(EventType.PROCESS_STATE_STARTING, handler)
+                with self.assertRaises(asyncio.CancelledError):
+                    await bus._dispatch(Event(EventType.PROCESS_STATE_STARTING, {}))
+                await bus.stop()
+
+        asyncio.run(run())
+
+    def test_full_queue_drops_oldest_event(self):
+        async def handler(event):
+            pass
+
+        bus = EventBus(maxsize=2)
+        bus.subscribe(EventType.PROCESS_STATE_STARTING, handler)
+        for pid in (1, 2, 3):
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {"pid": pid}))
+
+        self.assertEqual([e.payload["pid"] for e in bus._queue], [2, 3])
+        self.assertEqual(bus._dropped_events, 1)
+
+    def test_subscribe_during_dispatch_applies_to_next_event(self):
+        async def run():
+            bus = EventBus()
+            bus.start()
+
+            late_calls = []
+
+            async def late(event):
+                late_calls.append(event)
+
+            async def first(event):
+                bus.subscribe(EventType.PROCESS_STATE_STARTING, late)
+
+            bus.subscribe(EventType.PROCESS_STATE_STARTING, first)
+
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {}))
+            await asyncio.sleep(0.05)
+            self.assertEqual(late_calls, [])
+
+            bus.publish(Event(EventType.PROCESS_STATE_STARTING, {}))
+            await asyncio.sleep(0.05)
+            await bus.stop()
+            self.assertEqual(len(late_calls), 1)
+
+        asyncio.run(run())
+
 
 class TestRPCServer(unittest.TestCase):
     def test_server_lifecycle(self):
@@ -200,6 +306,24 @@ autostart=false
 
         asyncio.run(run())
 
+    def test_unchanged_config_reload_is_a_no_op(self) -> None:
+        async def run() -> None:
+            path = _write_config(self.BASE + "\n[group:mygroup]\nprograms=worker\n")
+            sup = Supervisor()
+            sup.load_config(path)
+            processes = dict(sup.processes)
+
+            with patch.object(sup, "_rebuild_groups") as rebuild:
+                result = await sup.reload_config()
+            rebuild.assert_not_called()
+
+            self.assertEqual(result, {"added": [], "removed": [], "changed": []})
+            self.assertEqual(sup.processes, processes)
+            self.assertEqual(sup.groups["mygroup"], ["worker"])
+            os.remove(path)
+
+        asyncio.run(run())
+
 
 class TestPidfileSafety(unittest.TestCase):
     """H3: pidfile must only be removed when it holds our own PID."""
@@ -3,8 +3,11 @@
 import asyncio
 import socket
 import unittest
+from unittest.mock import AsyncMock, patch
 
+from supervice import health
 from supervice.health import (
+    HealthChecker,
     HealthCheckResult,
     ScriptHealthChecker,
     TCPHealthChecker,
@@ -92,6 +95,31 @@ class TestTCPHealthChecker(unittest.TestCase):
 
         asyncio.run(run())
 
+    def test_hostname_resolved_once_per_ttl(self) -> None:
+        """Repeated probes of a hostname reuse the resolved address."""
+
+        async def run() -> None:
+            server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            infos = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+            loop = asyncio.get_running_loop()
+            health._addr_cache.clear()
+            try:
+                with patch.object(loop, "getaddrinfo", AsyncMock(return_value=infos)) as gai:
+                    config = HealthCheckConfig(
+                        type=HealthCheckType.TCP, port=port, host="probe.invalid"
+                    )
+                    for _ in range(3):
+                        result = await TCPHealthChecker(config).check()
+                        self.assertTrue(result.healthy, result.message)
+                    self.assertEqual(gai.call_count, 1)
+            finally:
+                health._addr_cache.clear()
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(run())
+
     def test_tcp_check_no_port_configured(self) -> None:
         """Test TCP check fails gracefully when no port is configured."""
 
@@ -193,6 +221,53 @@ class TestScriptHealthChecker(unittest.TestCase):
 
         asyncio.run(run())
 
+    def test_script_check_success_ignores_stderr(self) -> None:
+        """Output on stderr does not matter when the script exits 0."""
+
+        async def run() -> None:
+            config = HealthCheckConfig(
+                type=HealthCheckType.SCRIPT, command="echo 'just noise' >&2; exit 0", timeout=5
+            )
+            result = await ScriptHealthChecker(config).check()
+
+            self.assertTrue(result.healthy)
+            self.assertNotIn("noise", result.message)
+
+        asyncio.run(run())
+
+    def test_script_check_large_stderr_does_not_stall(self) -> None:
+        """A script that writes more than the pipe buffer to stderr still finishes."""
+
+        async def run() -> None:
+            config = HealthCheckConfig(
+                type=HealthCheckType.SCRIPT,
+                command="head -c 300000 /dev/zero >&2; exit 0",
+                timeout=2,
+            )
+            result = await asyncio.wait_for(ScriptHealthChecker(config).check(), timeout=10)
+
+            self.assertTrue(result.healthy)
+
+        asyncio.run(run())
+
+    def test_plain_command_skips_shell(self) -> None:
+        """Commands without shell syntax are exec'd directly."""
+        self.assertEqual(
+            ScriptHealthChecker(HealthCheckConfig(command="true --flag 'a b'"))._argv,
+            ["true", "--flag", "a b"],
+        )
+        for command in ("exit 0", "FOO=1 true", "true; false", "test -f ~/x", "true $HOME"):
+            checker = ScriptHealthChecker(HealthCheckConfig(command=command))
+            self.assertIsNone(checker._argv, command)
+
+        async def run() -> None:
+            config = HealthCheckConfig(type=HealthCheckType.SCRIPT, command="false", timeout=5)
+            result = await ScriptHealthChecker(config).check()
+            self.assertFalse(result.healthy)
+            self.assertIn("code 1", result.message)
+
+        asyncio.run(run())
+
     def test_script_check_no_command(self) -> None:
         """Test script check fails gracefully when no command is configured."""
 
@@ -210,6 +285,13 @@ class TestScriptHealthChecker(unittest.TestCase):
 class TestHealthCheckerFactory(unittest.TestCase):
     """Tests for health checker factory function."""
 
+    def test_checker_without_check_cannot_be_created(self) -> None:
+        class Incomplete(HealthChecker):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete(HealthCheckConfig())  # type: ignore[abstract]
+
     def test_create_tcp_checker(self) -> None:
         config = HealthCheckConfig(type=HealthCheckType.TCP, port=8080)
         checker = create_health_checker(config)
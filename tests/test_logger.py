@@ -18,25 +18,22 @@ class TestLogger(unittest.TestCase):
         self.assertTrue(any(isinstance(h, logging.StreamHandler) for h in logger.handlers))
 
     def test_setup_logger_file(self):
-        with tempfile.NamedTemporaryFile(delete=False) as f:
-            fname = f.name
-
-        try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, "supervice.log")
             logger = setup_logger(level="WARN", logfile=fname)
-            self.assertEqual(logger.level, logging.WARN)
-            self.assertTrue(any(isinstance(h, logging.FileHandler) for h in logger.handlers))
-
-            logger.warning("Test Message")
-
-            # Verify write
-            with open(fname) as f:
-                content = f.read()
-                self.assertIn("Test Message", content)
-        finally:
-            # close handlers to allow delete
-            for h in logger.handlers:
-                h.close()
-            os.remove(fname)
+            try:
+                self.assertEqual(logger.level, logging.WARN)
+                self.assertTrue(any(isinstance(h, logging.FileHandler) for h in logger.handlers))
+
+                logger.warning("Test Message")
+
+                # Verify write
+                with open(fname) as f:
+                    self.assertIn("Test Message", f.read())
+            finally:
+                # close handlers before the directory goes away
+                for h in logger.handlers:
+                    h.close()
 
     def test_invalid_level(self):
         with self.assertRaises(ValueError):
@@ -1,9 +1,11 @@
 import asyncio
 import os
+import sys
 import tempfile
 import unittest
 
 from supervice.events import EventBus
+from supervice.main import _use_pidfd_child_watcher
 from supervice.models import ProgramConfig
 from supervice.process import (
     BACKOFF,
@@ -16,6 +18,24 @@ from supervice.process import (
 
 
 class TestProcessLifecycle(unittest.TestCase):
+    # One loop for the whole class: asyncio.run() per test would rebuild the
+    # selector and child watcher every time.
+    loop: asyncio.AbstractEventLoop
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.loop = asyncio.new_event_loop()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        pending = asyncio.all_tasks(cls.loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            cls.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        cls.loop.run_until_complete(cls.loop.shutdown_asyncgens())
+        cls.loop.close()
+
     def setUp(self) -> None:
         self.event_bus = EventBus()
 
@@ -35,7 +55,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_spawn_failure_command_not_found(self) -> None:
         """A missing command is retryable (covers binaries mid-deploy): one
@@ -50,10 +70,12 @@ class TestProcessLifecycle(unittest.TestCase):
             await process.spawn()
 
             self.assertEqual(process.state, EXITED)
+            # The PATH lookup fails before anything is forked.
+            self.assertIsNone(process.process)
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_kill_process(self) -> None:
         """Test killing a running process transitions to STOPPED."""
@@ -66,7 +88,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             # Start spawn in background
             spawn_task = asyncio.create_task(process.spawn())
-            await asyncio.sleep(0.3)  # Let it start
+            await process._wait_for_state((RUNNING,), timeout=3)
 
             self.assertEqual(process.state, RUNNING)
 
@@ -82,7 +104,36 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
+
+    def test_kill_sends_prefixed_stopsignal(self) -> None:
+        """A stopsignal spelled "SIGUSR1" must not fall back to SIGTERM."""
+
+        async def run() -> None:
+            self.event_bus.start()
+            with tempfile.TemporaryDirectory() as tmpdir:
+                ready = os.path.join(tmpdir, "ready")
+                config = ProgramConfig(
+                    name="test",
+                    command="sh -c 'trap \"exit 42\" USR1; touch %s; while :; do sleep 0.1; done'"
+                    % ready,
+                    stopsignal="SIGUSR1",
+                    startsecs=0,
+                )
+                process = Process(config, self.event_bus)
+                spawn_task = asyncio.create_task(process.spawn())
+                for _ in range(100):
+                    if os.path.exists(ready):
+                        break
+                    await asyncio.sleep(0.02)
+
+                await process.kill()
+
+                self.assertEqual(process.process.returncode, 42)
+                await asyncio.wait_for(spawn_task, timeout=3)
+            await self.event_bus.stop()
+
+        self.loop.run_until_complete(run())
 
     def test_kill_process_group(self) -> None:
         """Test that kill terminates child processes too."""
@@ -95,7 +146,7 @@ class TestProcessLifecycle(unittest.TestCase):
             process = Process(config, self.event_bus)
 
             spawn_task = asyncio.create_task(process.spawn())
-            await asyncio.sleep(0.3)  # Let processes start
+            await process._wait_for_state((RUNNING,), timeout=3)
 
             self.assertEqual(process.state, RUNNING)
             pid = process.process.pid
@@ -116,7 +167,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_restart_on_failure(self) -> None:
         """Test that process restarts after failure with autorestart=True."""
@@ -160,7 +211,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_file_handles_closed_on_error(self) -> None:
         """Test file handles are closed even if spawn fails."""
@@ -193,7 +244,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_file_handles_closed_on_success(self) -> None:
         """Test file handles are closed after successful spawn."""
@@ -224,7 +275,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_process_with_environment(self) -> None:
         """Test process runs with custom environment variables."""
@@ -251,7 +302,34 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
+
+    def test_updated_environment_reaches_next_spawn(self) -> None:
+        """The cached child environment is rebuilt after a config update."""
+
+        async def run() -> None:
+            self.event_bus.start()
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                out_file = os.path.join(tmpdir, "out.txt")
+                command = f"sh -c 'echo $MY_VAR > {out_file}'"
+                process = Process(
+                    ProgramConfig(name="test", command=command, environment={"MY_VAR": "old"}),
+                    self.event_bus,
+                )
+                await process.spawn()
+
+                process.update_config(
+                    ProgramConfig(name="test", command=command, environment={"MY_VAR": "new"})
+                )
+                await process.spawn()
+
+                with open(out_file) as f:
+                    self.assertEqual(f.read().strip(), "new")
+
+            await self.event_bus.stop()
+
+        self.loop.run_until_complete(run())
 
     def test_process_with_directory(self) -> None:
         """Test process runs in specified directory."""
@@ -280,7 +358,7 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_start_stop_process_rpc(self) -> None:
         """Test start_process and stop_process RPC methods."""
@@ -317,7 +395,36 @@ class TestProcessLifecycle(unittest.TestCase):
 
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
+
+    def test_idle_supervise_loop_does_not_poll(self) -> None:
+        """An idle program's supervise loop sleeps until something happens."""
+
+        async def run() -> None:
+            self.event_bus.start()
+            config = ProgramConfig(name="test", command="sleep 60", autostart=False, startsecs=0)
+            process = Process(config, self.event_bus)
+
+            idle_waits = 0
+            original_wait_idle = process._wait_idle
+
+            async def counting_wait_idle() -> None:
+                nonlocal idle_waits
+                idle_waits += 1
+                await original_wait_idle()
+
+            process._wait_idle = counting_wait_idle  # type: ignore[method-assign]
+            await process.start()
+            await asyncio.sleep(0.5)
+            self.assertLessEqual(idle_waits, 1)
+
+            # A start request still wakes it immediately.
+            self.assertEqual(await asyncio.wait_for(process.start_process(), timeout=3), RUNNING)
+
+            await process.stop()
+            await self.event_bus.stop()
+
+        self.loop.run_until_complete(run())
 
     def test_exit_code_127_not_treated_as_preexec_failure(self) -> None:
         """C1: a program exiting 127 must go EXITED (restartable), not FATAL."""
@@ -337,7 +444,7 @@ class TestProcessLifecycle(unittest.TestCase):
             self.assertEqual(process.process.returncode, 127)
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_exit_code_126_not_treated_as_user_switch_failure(self) -> None:
         """C1: a program (no user set) exiting 126 must go EXITED, not FATAL."""
@@ -351,7 +458,7 @@ class TestProcessLifecycle(unittest.TestCase):
             self.assertEqual(process.process.returncode, 126)
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
     def test_start_process_returns_promptly_via_supervise(self) -> None:
         """C3: start_process must observe the RUNNING transition, not hang."""
@@ -381,20 +488,46 @@ class TestProcessLifecycle(unittest.TestCase):
                 task.cancel()
             await self.event_bus.stop()
 
-        asyncio.run(run())
+        self.loop.run_until_complete(run())
 
-    def test_change_state_leaves_event_set_for_late_waiter(self) -> None:
-        """C3: _change_state must not set-then-clear; a late waiter still sees it."""
+    def test_change_state_is_seen_by_late_waiter(self) -> None:
+        """C3: a waiter arriving after a transition must not miss it."""
 
         async def run() -> None:
             config = ProgramConfig(name="test", command="sleep 60")
             process = Process(config, self.event_bus)
             await process._change_state(RUNNING)
-            # Event stays set after the transition so a waiter arriving late
-            # does not block on an already-happened change.
-            self.assertTrue(process._state_changed.is_set())
-
-        asyncio.run(run())
+            # The waiter must not block on an already-happened change.
+            await asyncio.wait_for(process._wait_for_state((RUNNING,), 5.0), timeout=0.5)
+
+        self.loop.run_until_complete(run())
+
+
+@unittest.skipIf(sys.version_info >= (3, 12), "pidfd watcher is the default")
+class TestPidfdChildWatcher(unittest.TestCase):
+    def test_spawn_and_kill_under_pidfd_child_watcher(self) -> None:
+        _use_pidfd_child_watcher()
+        try:
+            if not isinstance(asyncio.get_child_watcher(), asyncio.PidfdChildWatcher):
+                self.skipTest("pidfd_open not available")
+
+            async def run() -> None:
+                event_bus = EventBus()
+                event_bus.start()
+                config = ProgramConfig(name="test", command="sleep 60", startsecs=0)
+                process = Process(config, event_bus)
+                spawn_task = asyncio.create_task(process.spawn())
+                await process._wait_for_state((RUNNING,), 3)
+                self.assertEqual(process.state, RUNNING)
+                await process.kill()
+                self.assertEqual(process.state, STOPPED)
+                await asyncio.wait_for(spawn_task, timeout=3)
+                await event_bus.stop()
+
+            # asyncio.run, like main(), attaches the watcher to its loop.
+            asyncio.run(run())
+        finally:
+            asyncio.set_child_watcher(None)
 
 
 if __name__ == "__main__":
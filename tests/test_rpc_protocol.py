@@ -6,9 +6,12 @@ import os
 import struct
 import tempfile
 import unittest
+from collections.abc import Iterable
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
-from supervice.rpc import HEADER_SIZE, MAX_MESSAGE_SIZE, RPCServer
+from supervice.client import Controller
+from supervice.rpc import HEADER_SIZE, MAX_MESSAGE_SIZE, VALID_COMMANDS, RPCServer
 
 
 class TestLengthPrefixedProtocol(unittest.TestCase):
@@ -21,8 +24,9 @@ class TestLengthPrefixedProtocol(unittest.TestCase):
             message = b'{"command": "status"}'
             header = struct.pack(">I", len(message))
 
-            reader = MagicMock()
-            reader.readexactly = AsyncMock(side_effect=[header, message])
+            reader = asyncio.StreamReader()
+            reader.feed_data(header + message)
+            reader.feed_eof()
 
             server = RPCServer("sock", MagicMock())
             result = await server._read_message(reader)
@@ -38,8 +42,9 @@ class TestLengthPrefixedProtocol(unittest.TestCase):
             # Create a header claiming message is larger than MAX_MESSAGE_SIZE
             header = struct.pack(">I", MAX_MESSAGE_SIZE + 1)
 
-            reader = MagicMock()
-            reader.readexactly = AsyncMock(return_value=header)
+            reader = asyncio.StreamReader()
+            reader.feed_data(header)
+            reader.feed_eof()
 
             server = RPCServer("sock", MagicMock())
             with self.assertRaises(ValueError) as ctx:
@@ -60,11 +65,11 @@ class TestLengthPrefixedProtocol(unittest.TestCase):
             message = b'{"status": "ok"}'
             await server._write_message(writer, message)
 
-            # Check that write was called with header + message
-            call_args = writer.write.call_args[0][0]
+            # Check that the header and message were written back to back
+            written = b"".join(writer.writelines.call_args[0][0])
             expected_header = struct.pack(">I", len(message))
-            self.assertEqual(call_args[:HEADER_SIZE], expected_header)
-            self.assertEqual(call_args[HEADER_SIZE:], message)
+            self.assertEqual(written[:HEADER_SIZE], expected_header)
+            self.assertEqual(written[HEADER_SIZE:], message)
 
         asyncio.run(run())
 
@@ -76,8 +81,7 @@ class TestRPCValidation(unittest.TestCase):
         """Test that unknown commands are rejected with proper error."""
 
         async def run() -> None:
-            supervisor = MagicMock()
-            supervisor.processes = {}
+            supervisor = SimpleNamespace(processes={}, groups={})
 
             server = RPCServer("sock", supervisor)
             result = await server.process_request({"command": "invalid_xyz"})
@@ -86,13 +90,15 @@ class TestRPCValidation(unittest.TestCase):
 
         asyncio.run(run())
 
+    def test_every_valid_command_has_a_handler(self) -> None:
+        server = RPCServer("sock", MagicMock())
+        self.assertEqual(set(server._handlers), VALID_COMMANDS)
+
     def test_valid_commands_accepted(self) -> None:
         """Test that valid commands are processed."""
 
         async def run() -> None:
-            supervisor = MagicMock()
-            supervisor.processes = {}
-            supervisor.groups = {}
+            supervisor = SimpleNamespace(processes={}, groups={})
 
             server = RPCServer("sock", supervisor)
 
@@ -135,6 +141,9 @@ class TestJSONErrorHandling(unittest.TestCase):
                 def write(self, data: bytes) -> None:
                     written.append(data)
 
+                def writelines(self, data: Iterable[bytes]) -> None:
+                    written.extend(data)
+
                 async def drain(self) -> None:
                     pass
 
@@ -163,9 +172,7 @@ class TestSocketHijackProtection(unittest.TestCase):
             tmpdir = tempfile.mkdtemp()
             socket_path = os.path.join(tmpdir, "live.sock")
 
-            supervisor = MagicMock()
-            supervisor.processes = {}
-            supervisor.groups = {}
+            supervisor = SimpleNamespace(processes={}, groups={})
 
             first = RPCServer(socket_path, supervisor)
             await first.start()
@@ -191,9 +198,7 @@ class TestSocketHijackProtection(unittest.TestCase):
                 pass
             self.assertTrue(os.path.exists(socket_path))
 
-            supervisor = MagicMock()
-            supervisor.processes = {}
-            supervisor.groups = {}
+            supervisor = SimpleNamespace(processes={}, groups={})
 
             server = RPCServer(socket_path, supervisor)
             await server.start()  # should replace the stale file
@@ -205,5 +210,61 @@ class TestSocketHijackProtection(unittest.TestCase):
         asyncio.run(run())
 
 
+class TestControllerConnectionReuse(unittest.TestCase):
+    """Batched commands share one connection and survive server-side close."""
+
+    def _server(self) -> RPCServer:
+        tmpdir = tempfile.mkdtemp()
+        supervisor = SimpleNamespace(processes={}, groups={})
+        return RPCServer(os.path.join(tmpdir, "ctl.sock"), supervisor)
+
+    def test_commands_share_one_connection(self) -> None:
+        async def run() -> None:
+            server = self._server()
+            await server.start()
+            try:
+                async with Controller(server.socket_path, timeout=5.0) as client:
+                    writer = client._writer
+                    for _ in range(3):
+                        response = await client.send_command("status")
+                        self.assertEqual(response["status"], "ok")
+                    self.assertIs(client._writer, writer)
+                    self.assertEqual(len(server._clients), 1)
+                self.assertIsNone(client._writer)
+            finally:
+                await server.stop()
+
+        asyncio.run(run())
+
+    def test_shared_connection_reconnects_after_server_close(self) -> None:
+        async def run() -> None:
+            server = self._server()
+            await server.start()
+            try:
+                async with Controller(server.socket_path, timeout=5.0) as client:
+                    for _ in range(3):
+                        response = await client.send_command("status")
+                        self.assertEqual(response["status"], "ok")
+                        # Drop the connection from the server side; the next
+                        # command has to go through the reconnect path.
+                        for writer in list(server._clients):
+                            writer.close()
+                        await asyncio.sleep(0.05)
+            finally:
+                await server.stop()
+
+        asyncio.run(run())
+
+    def test_stop_closes_idle_client_connections(self) -> None:
+        async def run() -> None:
+            server = self._server()
+            await server.start()
+            async with Controller(server.socket_path, timeout=5.0) as client:
+                await client.send_command("status")
+                await asyncio.wait_for(server.stop(), timeout=2)
+
+        asyncio.run(run())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,19 @@
 """Tests for configuration validation."""
 
 import os
+import signal
 import tempfile
 import unittest
+from unittest.mock import patch
 
 from supervice.config import (
     ConfigValidationError,
     _validate_directory,
+    _validate_logfile_path,
     _validate_positive_int,
     _validate_signal,
     parse_config,
+    parse_config_string,
 )
 
 
@@ -35,15 +39,33 @@ class TestSignalValidation(unittest.TestCase):
         # SIGTERM should work (strips SIG prefix)
         _validate_signal("SIGTERM", "test")
 
+    def test_signal_spellings_resolve_to_number(self) -> None:
+        for name in ("USR1", "SIGUSR1", "usr1", "sigusr1"):
+            self.assertEqual(_validate_signal(name, "test"), signal.SIGUSR1)
+
 
 class TestDirectoryValidation(unittest.TestCase):
     """Tests for directory validation."""
 
+    tmpdir: str
+    _tmp: tempfile.TemporaryDirectory[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One scratch directory (holding one plain file) serves every case.
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.tmpdir = cls._tmp.name
+        with open(os.path.join(cls.tmpdir, "file"), "w"):
+            pass
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._tmp.cleanup()
+
     def test_existing_directory_passes(self) -> None:
         """Test that existing directories pass validation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Should not raise
-            _validate_directory(tmpdir, "test")
+        # Should not raise
+        _validate_directory(self.tmpdir, "test")
 
     def test_nonexistent_directory_raises(self) -> None:
         """Test that nonexistent directories raise ConfigValidationError."""
@@ -53,11 +75,82 @@ class TestDirectoryValidation(unittest.TestCase):
 
     def test_file_instead_of_directory_raises(self) -> None:
         """Test that files (not directories) raise ConfigValidationError."""
+        with self.assertRaises(ConfigValidationError) as ctx:
+            _validate_directory(os.path.join(self.tmpdir, "file"), "testprog")
+        self.assertIn("not a directory", str(ctx.exception))
+
+
+class TestLogfilePathValidation(unittest.TestCase):
+    """Tests for log file parent-directory validation."""
+
+    def test_missing_log_directory_raises(self) -> None:
+        with self.assertRaises(ConfigValidationError) as ctx:
+            _validate_logfile_path(
+                "/nonexistent/path/xyz12345/out.log", "stdout_logfile", "testprog"
+            )
+        self.assertIn("does not exist", str(ctx.exception))
+
+    def test_file_as_log_directory_raises(self) -> None:
+        """A regular file where the log directory should be is rejected at load."""
         with tempfile.NamedTemporaryFile() as f:
             with self.assertRaises(ConfigValidationError) as ctx:
-                _validate_directory(f.name, "testprog")
+                _validate_logfile_path(
+                    os.path.join(f.name, "out.log"), "stdout_logfile", "testprog"
+                )
             self.assertIn("not a directory", str(ctx.exception))
 
+    def test_shared_log_directory_checked_once_per_load(self) -> None:
+        logdir = tempfile.mkdtemp()
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
+            for name in ("a", "b", "c"):
+                f.write(
+                    "[program:%s]\ncommand=echo\nstdout_logfile=%s/%s.log\n" % (name, logdir, name)
+                )
+            fname = f.name
+
+        try:
+            with patch("supervice.config.os.access", return_value=True) as access:
+                parse_config(fname)
+                self.assertEqual(access.call_count, 1)
+            # A later load must look again: the directory may have gone.
+            os.rmdir(logdir)
+            with self.assertRaises(ConfigValidationError):
+                parse_config(fname)
+        finally:
+            os.remove(fname)
+            if os.path.isdir(logdir):
+                os.rmdir(logdir)
+
+
+class TestUserValidation(unittest.TestCase):
+    """Tests for user lookup during config loading."""
+
+    CONFIG = """
+[program:a]
+command=echo a
+user=svc
+
+[program:b]
+command=echo b
+user=svc
+"""
+
+    def test_shared_user_looked_up_once_per_load(self) -> None:
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
+            f.write(self.CONFIG)
+            fname = f.name
+
+        try:
+            with patch("supervice.config.pwd.getpwnam") as getpwnam:
+                parse_config(fname)
+                self.assertEqual(getpwnam.call_count, 1)
+                # A later load must look again: the user may have been removed.
+                getpwnam.side_effect = KeyError("svc")
+                with self.assertRaises(ConfigValidationError):
+                    parse_config(fname)
+        finally:
+            os.remove(fname)
+
 
 class TestNumericValidation(unittest.TestCase):
     """Tests for numeric bounds validation."""
@@ -85,16 +178,9 @@ class TestConfigValidation(unittest.TestCase):
 command=echo hello
 stopsignal=INVALID
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
-
-        try:
-            with self.assertRaises(ConfigValidationError) as ctx:
-                parse_config(fname)
-            self.assertIn("stopsignal", str(ctx.exception).lower())
-        finally:
-            os.remove(fname)
+        with self.assertRaises(ConfigValidationError) as ctx:
+            parse_config_string(config_content)
+        self.assertEqual(ctx.exception.field, "stopsignal")
 
     def test_invalid_loglevel_raises(self) -> None:
         """Test that invalid loglevel raises ConfigValidationError."""
@@ -102,16 +188,9 @@ stopsignal=INVALID
 [supervice]
 loglevel=INVALID
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
-
-        try:
-            with self.assertRaises(ConfigValidationError) as ctx:
-                parse_config(fname)
-            self.assertIn("loglevel", str(ctx.exception).lower())
-        finally:
-            os.remove(fname)
+        with self.assertRaises(ConfigValidationError) as ctx:
+            parse_config_string(config_content)
+        self.assertEqual(ctx.exception.field, "loglevel")
 
     def test_zero_numprocs_raises(self) -> None:
         """Test that numprocs=0 raises ConfigValidationError."""
@@ -120,16 +199,9 @@ loglevel=INVALID
 command=echo hello
 numprocs=0
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
-
-        try:
-            with self.assertRaises(ConfigValidationError) as ctx:
-                parse_config(fname)
-            self.assertIn("numprocs", str(ctx.exception))
-        finally:
-            os.remove(fname)
+        with self.assertRaises(ConfigValidationError) as ctx:
+            parse_config_string(config_content)
+        self.assertEqual(ctx.exception.field, "numprocs")
 
     def test_valid_config_with_health_checks(self) -> None:
         """Test that valid config with health checks parses correctly."""
@@ -147,21 +219,14 @@ healthcheck_interval=10
 healthcheck_timeout=5
 healthcheck_retries=3
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
+        config = parse_config_string(config_content)
+        self.assertEqual(config.socket_path, "/tmp/test.sock")
+        self.assertEqual(config.shutdown_timeout, 30)
+        self.assertEqual(len(config.programs), 1)
 
-        try:
-            config = parse_config(fname)
-            self.assertEqual(config.socket_path, "/tmp/test.sock")
-            self.assertEqual(config.shutdown_timeout, 30)
-            self.assertEqual(len(config.programs), 1)
-
-            prog = config.programs[0]
-            self.assertEqual(prog.healthcheck.port, 8080)
-            self.assertEqual(prog.healthcheck.interval, 10)
-        finally:
-            os.remove(fname)
+        prog = config.programs[0]
+        self.assertEqual(prog.healthcheck.port, 8080)
+        self.assertEqual(prog.healthcheck.interval, 10)
 
     def test_tcp_healthcheck_missing_port_raises(self) -> None:
         """Test that TCP health check without port raises error."""
@@ -170,16 +235,9 @@ healthcheck_retries=3
 command=echo hello
 healthcheck_type=tcp
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
-
-        try:
-            with self.assertRaises(ConfigValidationError) as ctx:
-                parse_config(fname)
-            self.assertIn("healthcheck_port", str(ctx.exception))
-        finally:
-            os.remove(fname)
+        with self.assertRaises(ConfigValidationError) as ctx:
+            parse_config_string(config_content)
+        self.assertEqual(ctx.exception.field, "healthcheck_port")
 
     def test_script_healthcheck_missing_command_raises(self) -> None:
         """Test that script health check without command raises error."""
@@ -188,16 +246,9 @@ healthcheck_type=tcp
 command=echo hello
 healthcheck_type=script
 """
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".conf") as f:
-            f.write(config_content)
-            fname = f.name
-
-        try:
-            with self.assertRaises(ConfigValidationError) as ctx:
-                parse_config(fname)
-            self.assertIn("healthcheck_command", str(ctx.exception))
-        finally:
-            os.remove(fname)
+        with self.assertRaises(ConfigValidationError) as ctx:
+            parse_config_string(config_content)
+        self.assertEqual(ctx.exception.field, "healthcheck_command")
 
 
 if __name__ == "__main__":